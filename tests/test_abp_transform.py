@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+from pathlib import Path
+from textwrap import dedent
+
+import duckdb
+
+from ukam_os_builder.api.settings import (
+    OSDownloadSettings,
+    PathSettings,
+    ProcessingSettings,
+    Settings,
+)
+from ukam_os_builder.data_sources.abp.transform.runner import run_flatfile_step
+from ukam_os_builder.os_builder.inspect_results import inspect_flatfile_variants
+
+
+def _build_raw_inputs(raw_dir: Path) -> None:
+    """Write a small synthetic set of ABP split parquet files.
+
+    Covers a parent/child pair, a non-postal UPRN, Welsh and historical LPIs,
+    organisations (current, historical and legal-name duplicates), delivery
+    points and classifications, so every transform stage emits something.
+    """
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect()
+
+    con.execute(f"""
+        COPY (
+            SELECT * FROM (VALUES
+                (1::BIGINT, NULL::BIGINT, 'AB1 2CD', 2, 'D'),
+                (2::BIGINT, 1::BIGINT,   'AB1 2CD', 2, 'D'),
+                (3::BIGINT, NULL::BIGINT,'AB9 9ZZ', 2, 'N'),
+                (4::BIGINT, NULL::BIGINT,'CF1 1AA', 2, 'D'),
+                (5::BIGINT, NULL::BIGINT,'AB3 4EF', 2, 'C'),
+                (6::BIGINT, NULL::BIGINT,'AB5 6GH', 2, NULL)
+            ) t(uprn, parent_uprn, postcode_locator, blpu_state, addressbase_postal)
+        ) TO '{(raw_dir / "blpu.parquet").as_posix()}' (FORMAT PARQUET)
+    """)
+
+    con.execute(f"""
+        COPY (
+            SELECT uprn, lpi_key, language, logical_status, official_flag, start_date,
+                   end_date, last_update_date, usrn,
+                   level::VARCHAR AS level,
+                   sao_text::VARCHAR AS sao_text,
+                   sao_start_number::INTEGER AS sao_start_number,
+                   sao_start_suffix::VARCHAR AS sao_start_suffix,
+                   sao_end_number::INTEGER AS sao_end_number,
+                   sao_end_suffix::VARCHAR AS sao_end_suffix,
+                   pao_text::VARCHAR AS pao_text,
+                   pao_start_number::INTEGER AS pao_start_number,
+                   pao_start_suffix::VARCHAR AS pao_start_suffix,
+                   pao_end_number::INTEGER AS pao_end_number,
+                   pao_end_suffix::VARCHAR AS pao_end_suffix
+            FROM (VALUES
+                (1::BIGINT,'K1','ENG',1,'Y',DATE '2000-01-01',NULL::DATE,DATE '2020-01-01',100::BIGINT,'1,2',NULL,1,NULL,NULL,NULL,NULL,'10',NULL,NULL,NULL),
+                (1::BIGINT,'K2','ENG',3,'N',DATE '1990-01-01',DATE '1999-12-31',DATE '2010-01-01',100::BIGINT,NULL,NULL,NULL,NULL,NULL,NULL,'ROSE COTTAGE',NULL,NULL,NULL,NULL),
+                (2::BIGINT,'K3','ENG',1,'Y',DATE '2005-01-01',NULL,DATE '2021-01-01',100::BIGINT,'2','FLAT A',NULL,NULL,NULL,NULL,NULL,'10',NULL,NULL,NULL),
+                (3::BIGINT,'K4','ENG',1,'Y',DATE '2005-01-01',NULL,DATE '2021-01-01',100::BIGINT,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'99',NULL,NULL,NULL),
+                (4::BIGINT,'K5','CYM',1,'Y',DATE '2005-01-01',NULL,DATE '2021-01-01',200::BIGINT,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'7',NULL,NULL,NULL),
+                (4::BIGINT,'K6','ENG',6,'Y',DATE '2005-01-01',NULL,DATE '2019-01-01',200::BIGINT,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'7',NULL,NULL,NULL),
+                (5::BIGINT,'K7','ENG',1,'Y',DATE '2001-01-01',NULL,DATE '2018-01-01',300::BIGINT,NULL,NULL,NULL,NULL,NULL,NULL,'UNIT 5',NULL,NULL,NULL,NULL),
+                (5::BIGINT,'K8','ENG',8,'Y',DATE '1980-01-01',DATE '2000-12-31',DATE '2000-12-31',300::BIGINT,NULL,NULL,NULL,NULL,NULL,NULL,'OLD UNIT 5',NULL,NULL,NULL,NULL),
+                (6::BIGINT,'K9','ENG',1,'Y',DATE '2001-01-01',NULL,DATE '2018-01-01',300::BIGINT,NULL,NULL,NULL,NULL,NULL,NULL,NULL,'12',NULL,'14','B')
+            ) t(uprn, lpi_key, language, logical_status, official_flag, start_date, end_date,
+                last_update_date, usrn, level,
+                sao_text, sao_start_number, sao_start_suffix, sao_end_number, sao_end_suffix,
+                pao_text, pao_start_number, pao_start_suffix, pao_end_number, pao_end_suffix)
+        ) TO '{(raw_dir / "lpi.parquet").as_posix()}' (FORMAT PARQUET)
+    """)
+
+    con.execute(f"""
+        COPY (
+            SELECT * FROM (VALUES
+                (100::BIGINT,'ENG','HIGH STREET','SOMEWHERE','TOWNVILLE',NULL::DATE,DATE '2015-01-01'),
+                (100::BIGINT,'ENG','HIGH ST (OLD)','SOMEWHERE','TOWNVILLE',DATE '1999-12-31',DATE '1999-01-01'),
+                (200::BIGINT,'CYM','STRYD FAWR','RHYWLE','TREFDINAS',NULL,DATE '2015-01-01'),
+                (200::BIGINT,'ENG','BIG STREET','SOMEPLACE','CITYTON',NULL,DATE '2015-01-01'),
+                (300::BIGINT,'ENG','LOW ROAD',NULL,'TOWNVILLE',NULL,DATE '2015-01-01')
+            ) t(usrn, language, street_description, locality, town_name, end_date, last_update_date)
+        ) TO '{(raw_dir / "street_descriptor.parquet").as_posix()}' (FORMAT PARQUET)
+    """)
+
+    con.execute(f"""
+        COPY (
+            SELECT * FROM (VALUES
+                (1::BIGINT,'THE RED LION','RED LION INNS LTD',DATE '2010-01-01',NULL::DATE),
+                (5::BIGINT,'OLD SHOP','OLD SHOP LTD',DATE '1995-01-01',DATE '1998-06-01'),
+                (5::BIGINT,'  NEW SHOP  ',NULL,DATE '2019-01-01',NULL),
+                (2::BIGINT,'SAME NAME','SAME NAME',DATE '2010-01-01',NULL),
+                (3::BIGINT,'GHOST CO',NULL,DATE '2010-01-01',NULL)
+            ) t(uprn, organisation, legal_name, start_date, end_date)
+        ) TO '{(raw_dir / "organisation.parquet").as_posix()}' (FORMAT PARQUET)
+    """)
+
+    con.execute(f"""
+        COPY (
+            SELECT uprn, udprn, postcode, end_date, last_update_date,
+                   department_name::VARCHAR AS department_name,
+                   organisation_name::VARCHAR AS organisation_name,
+                   sub_building_name::VARCHAR AS sub_building_name,
+                   building_name::VARCHAR AS building_name,
+                   building_number::VARCHAR AS building_number,
+                   dependent_thoroughfare::VARCHAR AS dependent_thoroughfare,
+                   thoroughfare::VARCHAR AS thoroughfare,
+                   double_dependent_locality::VARCHAR AS double_dependent_locality,
+                   dependent_locality::VARCHAR AS dependent_locality,
+                   post_town::VARCHAR AS post_town
+            FROM (VALUES
+                (1::BIGINT, 9001::BIGINT,'AB1 2CD',NULL::DATE,DATE '2020-01-01',NULL,'THE RED LION',NULL,NULL,'10',NULL,'HIGH STREET',NULL,NULL,'TOWNVILLE'),
+                (1::BIGINT, 9000::BIGINT,'AB1 2CD',DATE '2001-01-01',DATE '2001-01-01',NULL,NULL,NULL,NULL,'10',NULL,'HIGH STREET',NULL,NULL,'TOWNVILLE'),
+                (2::BIGINT, 9002::BIGINT,'AB1 2CD',NULL,DATE '2020-01-01',NULL,NULL,'FLAT A',NULL,'10',NULL,'HIGH STREET',NULL,NULL,'TOWNVILLE'),
+                (6::BIGINT, 9006::BIGINT,NULL,NULL,DATE '2020-01-01',NULL,NULL,NULL,NULL,'12',NULL,'LOW ROAD',NULL,NULL,'TOWNVILLE')
+            ) t(uprn, udprn, postcode, end_date, last_update_date,
+                department_name, organisation_name, sub_building_name, building_name,
+                building_number, dependent_thoroughfare, thoroughfare,
+                double_dependent_locality, dependent_locality, post_town)
+        ) TO '{(raw_dir / "delivery_point.parquet").as_posix()}' (FORMAT PARQUET)
+    """)
+
+    con.execute(f"""
+        COPY (
+            SELECT * FROM (VALUES
+                (1::BIGINT,'CR08','AddressBase Premium Classification Scheme',NULL::DATE,DATE '2020-01-01'),
+                (1::BIGINT,'C','Legacy Scheme',NULL,DATE '2021-01-01'),
+                (2::BIGINT,'RD06','AddressBase Premium Classification Scheme',NULL,DATE '2020-01-01')
+            ) t(uprn, classification_code, class_scheme, end_date, last_update_date)
+        ) TO '{(raw_dir / "classification.parquet").as_posix()}' (FORMAT PARQUET)
+    """)
+    con.close()
+
+
+def _make_settings(
+    work_dir: Path,
+    num_chunks: int = 1,
+    max_parallel_chunks: int = 1,
+    parquet_per_thread_output: bool = False,
+) -> Settings:
+    parquet_dir = work_dir / "parquet"
+    output_dir = work_dir / "output"
+    _build_raw_inputs(parquet_dir / "raw")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    return Settings(
+        paths=PathSettings(
+            work_dir=work_dir,
+            downloads_dir=work_dir / "downloads",
+            extracted_dir=work_dir / "extracted",
+            output_dir=output_dir,
+            parquet_dir=parquet_dir,
+        ),
+        os_downloads=OSDownloadSettings(package_id="test", version_id="test"),
+        processing=ProcessingSettings(
+            num_chunks=num_chunks,
+            max_parallel_chunks=max_parallel_chunks,
+            parquet_per_thread_output=parquet_per_thread_output,
+        ),
+        config_path=work_dir / "config.yaml",
+    )
+
+
+def _read_sorted_rows(output_paths: list[Path]) -> list[tuple]:
+    files = [
+        (path / "*.parquet").as_posix() if path.is_dir() else path.as_posix()
+        for path in output_paths
+    ]
+    con = duckdb.connect()
+    try:
+        return con.execute(f"""
+            SELECT * FROM read_parquet({files!r})
+            ORDER BY unique_id, address_concat, source, variant_label
+        """).fetchall()
+    finally:
+        con.close()
+
+
+def test_per_thread_output_writes_chunk_directories(tmp_path: Path) -> None:
+    plain = _make_settings(tmp_path / "plain")
+    plain_paths = run_flatfile_step(plain, force=True)
+
+    settings = _make_settings(tmp_path / "pto", num_chunks=2, parquet_per_thread_output=True)
+    output_paths = run_flatfile_step(settings, force=True)
+
+    assert len(output_paths) == 2
+    for path in output_paths:
+        assert path.is_dir()
+        assert path.suffix != ".parquet"
+        assert path.name.startswith("abp_for_uk_address_matcher.chunk_")
+        assert list(path.glob("*.parquet"))
+
+    # Same rows as a plain single-file run
+    assert _read_sorted_rows(output_paths) == _read_sorted_rows(plain_paths)
+
+
+def test_per_thread_output_rerun_is_a_noop(tmp_path: Path) -> None:
+    settings = _make_settings(tmp_path, num_chunks=2, parquet_per_thread_output=True)
+    first_paths = run_flatfile_step(settings, force=True)
+
+    parent_uprns = settings.paths.parquet_dir / "parent_uprns.parquet"
+    assert parent_uprns.exists()
+    parent_mtime = parent_uprns.stat().st_mtime_ns
+
+    # Without force, existing chunk directories are detected and nothing is
+    # rebuilt - including the derived parent-UPRN parquet
+    second_paths = run_flatfile_step(settings)
+    assert second_paths == first_paths
+    assert parent_uprns.stat().st_mtime_ns == parent_mtime
+
+
+def test_parallel_chunks_match_serial_run(tmp_path: Path) -> None:
+    serial = _make_settings(tmp_path / "serial", num_chunks=2, max_parallel_chunks=1)
+    serial_paths = run_flatfile_step(serial, force=True)
+
+    parallel = _make_settings(tmp_path / "parallel", num_chunks=2, max_parallel_chunks=2)
+    parallel_paths = run_flatfile_step(parallel, force=True)
+
+    assert len(parallel_paths) == 2
+    # The union of the parallel chunk outputs is the serial output
+    assert _read_sorted_rows(parallel_paths) == _read_sorted_rows(serial_paths)
+
+
+def test_inspect_results_finds_per_thread_directories(tmp_path: Path) -> None:
+    settings = _make_settings(tmp_path, num_chunks=2, parquet_per_thread_output=True)
+    run_flatfile_step(settings, force=True)
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        dedent(
+            """
+            source:
+              type: abp
+            paths:
+              output_dir: ./output
+            """
+        ).strip()
+        + "\n",
+        encoding="utf-8",
+    )
+
+    result = inspect_flatfile_variants(config_path=config_path, show=False)
+    assert result["files"]
+    assert all(path.suffix == ".parquet" for path in result["files"])
+    assert result["variant_count"] >= 1
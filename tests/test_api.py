@@ -339,6 +339,84 @@ def test_run_from_config_continues_when_api_preflight_is_offline(
     assert "Could not reach OS Data Hub during API preflight" in caplog.text
 
 
+def test_run_from_config_skips_preflight_when_cache_is_fresh(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setenv("OS_PROJECT_API_KEY", "key")
+    monkeypatch.setenv("OS_PROJECT_API_SECRET", "secret")
+
+    config_path = tmp_path / "config.yaml"
+    _write_config(
+        config_path,
+        """
+        source:
+          type: ngd
+
+        os_downloads:
+          package_id: "16465"
+          version_id: "104444"
+        """,
+    )
+
+    calls = {"preflight": 0}
+
+    def fake_check_api(_settings: object) -> None:
+        calls["preflight"] += 1
+
+    monkeypatch.setattr("ukam_os_builder.api.api.get_package_version", fake_check_api)
+    monkeypatch.setattr("ukam_os_builder.api.api.run_pipeline", lambda **_kwargs: None)
+
+    run_from_config(config_path=config_path, step="all")
+    assert calls["preflight"] == 1
+
+    # The recorded preflight is within its TTL, so the second run trusts it
+    run_from_config(config_path=config_path, step="all")
+    assert calls["preflight"] == 1
+
+    # force_api_check bypasses the cache
+    run_from_config(config_path=config_path, step="all", force_api_check=True)
+    assert calls["preflight"] == 2
+
+
+def test_run_from_config_preflight_cache_is_per_credentials(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setenv("OS_PROJECT_API_KEY", "key")
+    monkeypatch.setenv("OS_PROJECT_API_SECRET", "secret")
+
+    config_path = tmp_path / "config.yaml"
+    _write_config(
+        config_path,
+        """
+        source:
+          type: ngd
+
+        os_downloads:
+          package_id: "16465"
+          version_id: "104444"
+        """,
+    )
+
+    calls = {"preflight": 0}
+
+    def fake_check_api(_settings: object) -> None:
+        calls["preflight"] += 1
+
+    monkeypatch.setattr("ukam_os_builder.api.api.get_package_version", fake_check_api)
+    monkeypatch.setattr("ukam_os_builder.api.api.run_pipeline", lambda **_kwargs: None)
+
+    run_from_config(config_path=config_path, step="all")
+    assert calls["preflight"] == 1
+
+    # Different credentials must not reuse the cached verdict
+    monkeypatch.setenv("OS_PROJECT_API_KEY", "other-key")
+    monkeypatch.setenv("OS_PROJECT_API_SECRET", "other-secret")
+    run_from_config(config_path=config_path, step="all")
+    assert calls["preflight"] == 2
+
+
 def test_run_from_config_raises_when_list_only_api_preflight_is_offline(
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
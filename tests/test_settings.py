@@ -6,6 +6,7 @@ from textwrap import dedent
 import pytest
 from pydantic import ValidationError
 
+from ukam_os_builder.api.api import write_config_and_env
 from ukam_os_builder.api.settings import SettingsError, load_settings
 
 
@@ -250,3 +251,34 @@ def test_load_settings_rejects_legacy_path_keys(
 
     with pytest.raises(SettingsError, match="no longer supported"):
         load_settings(config_path, load_env=False)
+
+
+def test_load_settings_round_trips_json_config(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setenv("OS_PROJECT_API_KEY", "key")
+    monkeypatch.setenv("OS_PROJECT_API_SECRET", "secret")
+
+    config = {
+        "source": {"type": "abp"},
+        "os_downloads": {"package_id": "16465", "version_id": "104444"},
+        "paths": {"work_dir": "./data"},
+        "processing": {"num_chunks": 3},
+    }
+    config_path = tmp_path / "config.json"
+    write_config_and_env(
+        config,
+        config_out=config_path,
+        env_out=tmp_path / ".env",
+        write_env=False,
+        config_format="json",
+    )
+
+    settings = load_settings(config_path, load_env=False)
+
+    assert settings.source.type == "abp"
+    assert settings.os_downloads.package_id == "16465"
+    assert settings.os_downloads.version_id == "104444"
+    assert settings.paths.work_dir == (tmp_path / "data").resolve()
+    assert settings.processing.num_chunks == 3
@@ -97,6 +97,131 @@ def test_setup_wizard_skips_env_update_when_user_declines(
     assert captured["api_secret"] is None
 
 
+def test_setup_wizard_answers_file_populates_config(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    answers_path = tmp_path / "answers.yaml"
+    answers_path.write_text(
+        "source: abp\n"
+        "package_id: pkg-1\n"
+        "version_id: ver-1\n"
+        "work_dir: ./scratch\n"
+        "num_chunks: 4\n"
+        "api_key: key-1\n"
+        "api_secret: secret-1\n",
+        encoding="utf-8",
+    )
+
+    captured: dict[str, object] = {}
+
+    def fake_write_config_and_env(**kwargs):
+        captured.update(kwargs)
+        return Path(kwargs["config_out"]).resolve(), Path(kwargs["env_out"]).resolve(), True
+
+    monkeypatch.setattr(setup_wizard, "write_config_and_env", fake_write_config_and_env)
+
+    exit_code = setup_wizard.main(
+        [
+            "--config-out",
+            str(tmp_path / "config.yaml"),
+            "--env-out",
+            str(tmp_path / ".env"),
+            "--answers",
+            str(answers_path),
+        ]
+    )
+
+    assert exit_code == 0
+    config = captured["config"]
+    assert config["source"]["type"] == "abp"
+    assert config["os_downloads"]["package_id"] == "pkg-1"
+    assert config["os_downloads"]["version_id"] == "ver-1"
+    assert config["paths"] == {"work_dir": "./scratch"}
+    assert config["processing"]["num_chunks"] == 4
+    assert captured["api_key"] == "key-1"
+    assert captured["api_secret"] == "secret-1"
+
+
+def test_setup_wizard_answers_file_is_reread_between_runs(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    answers_path = tmp_path / "answers.yaml"
+    answers_path.write_text(
+        "source: ngd\npackage_id: pkg-1\nversion_id: ver-1\n",
+        encoding="utf-8",
+    )
+
+    captured: dict[str, object] = {}
+
+    def fake_write_config_and_env(**kwargs):
+        captured.update(kwargs)
+        return Path(kwargs["config_out"]).resolve(), Path(kwargs["env_out"]).resolve(), True
+
+    monkeypatch.setattr(setup_wizard, "write_config_and_env", fake_write_config_and_env)
+
+    argv = [
+        "--config-out",
+        str(tmp_path / "config.yaml"),
+        "--env-out",
+        str(tmp_path / ".env"),
+        "--answers",
+        str(answers_path),
+    ]
+    assert setup_wizard.main(argv) == 0
+    assert captured["config"]["os_downloads"]["version_id"] == "ver-1"
+
+    # Editing the file between runs must be picked up, not served stale
+    answers_path.write_text(
+        "source: ngd\npackage_id: pkg-1\nversion_id: ver-2\n",
+        encoding="utf-8",
+    )
+    assert setup_wizard.main(argv) == 0
+    assert captured["config"]["os_downloads"]["version_id"] == "ver-2"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        # Missing required version_id
+        "source: ngd\npackage_id: pkg-1\n",
+        # Unknown source type
+        "source: nope\npackage_id: pkg-1\nversion_id: ver-1\n",
+        # api_key without api_secret
+        "source: ngd\npackage_id: pkg-1\nversion_id: ver-1\napi_key: key-1\n",
+        # Not a mapping at all
+        "- just\n- a\n- list\n",
+    ],
+)
+def test_setup_wizard_rejects_invalid_answers_file(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    content: str,
+) -> None:
+    answers_path = tmp_path / "answers.yaml"
+    answers_path.write_text(content, encoding="utf-8")
+
+    monkeypatch.setattr(
+        setup_wizard,
+        "write_config_and_env",
+        lambda **kwargs: pytest.fail("config must not be written for invalid answers"),
+    )
+
+    with pytest.raises(SystemExit) as excinfo:
+        setup_wizard.main(
+            [
+                "--config-out",
+                str(tmp_path / "config.yaml"),
+                "--env-out",
+                str(tmp_path / ".env"),
+                "--answers",
+                str(answers_path),
+            ]
+        )
+    assert excinfo.value.code == 2
+
+
 def test_setup_wizard_decline_overwrite_keeps_existing_env(
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
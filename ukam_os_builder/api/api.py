@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
 import logging
 import os
+import time
 from pathlib import Path
 from typing import Any, Literal
 
 import requests
-import yaml
 
-from ukam_os_builder.api.settings import Settings, SettingsError, load_settings
+from ukam_os_builder.api.settings import (
+    Settings,
+    SettingsError,
+    _credentials_fingerprint,
+    _read_yaml_cached,
+    load_settings,
+)
 from ukam_os_builder.os_builder.os_hub import _get_manifest_path, get_package_version
 from ukam_os_builder.pipeline import run as run_pipeline
 from ukam_os_builder.pipeline import supported_steps_for_source
@@ -37,6 +46,48 @@ DEFAULT_CONFIG: dict[str, object] = {
 }
 
 
+# Annotated config template, parsed once at import; render_annotated_config
+# fills it via format_map instead of re-concatenating ~30 fragments per call.
+_CONFIG_TEMPLATE = (
+    "# UKAM OS Builder Configuration\n"
+    "# All paths are relative to this config file's directory unless absolute\n\n"
+    "paths:\n"
+    "  # Base working directory for all data\n"
+    "  work_dir: {work_dir}\n"
+    "\n"
+    "  # Most users won't need this: override derived directories only if required\n"
+    "  # overrides:\n"
+    "  #   downloads_dir: ./somewhere/downloads\n"
+    "  #   extracted_dir: /mnt/fast/extracted\n"
+    "  #   parquet_dir: ./data/parquet\n"
+    "  #   output_dir: ./output\n\n"
+    "source:\n"
+    "  # Source dataset to process: ngd or abp\n"
+    "  type: {source_type}\n\n"
+    "# OS Data Hub download settings\n"
+    "# Data package and version IDs are mandatory and taken from OS Data Hub\n"
+    "# API docs: https://api.os.uk/downloads/v1\n"
+    "os_downloads:\n"
+    "  # Data package ID from OS Data Hub\n"
+    '  package_id: "{package_id}"\n'
+    "  # Version ID (update this when new data is released)\n"
+    '  version_id: "{version_id}"\n\n'
+    "# Processing options\n"
+    "processing:\n"
+    "  # Parquet compression codec for intermediate/final files\n"
+    "  parquet_compression: {parquet_compression}\n"
+    "  # Compression level (higher usually means smaller files but slower writes)\n"
+    "  parquet_compression_level: {parquet_compression_level}\n\n"
+    "  # DuckDB memory limit (optional)\n"
+    "  # If set, limits how much RAM DuckDB can use (e.g., '4GB', '500MB')\n"
+    "  # If not set, DuckDB uses its default memory strategy\n"
+    "{duckdb_memory_limit_line}\n"
+    "  # Number of chunks to split flatfile processing into (default: 1)\n"
+    "  # Use higher values (e.g., 10-20) for lower memory usage\n"
+    "  num_chunks: {num_chunks}\n"
+)
+
+
 def render_annotated_config(config: dict[str, object]) -> str:
     """Render config YAML with explanatory comments."""
     paths = config["paths"]
@@ -50,72 +101,76 @@ def render_annotated_config(config: dict[str, object]) -> str:
         else '  # duckdb_memory_limit: "8GB"\n'
     )
 
-    return (
-        "# UKAM OS Builder Configuration\n"
-        "# All paths are relative to this config file's directory unless absolute\n\n"
-        "paths:\n"
-        "  # Base working directory for all data\n"
-        f"  work_dir: {paths['work_dir']}\n"
-        "\n"
-        "  # Most users won't need this: override derived directories only if required\n"
-        "  # overrides:\n"
-        "  #   downloads_dir: ./somewhere/downloads\n"
-        "  #   extracted_dir: /mnt/fast/extracted\n"
-        "  #   parquet_dir: ./data/parquet\n"
-        "  #   output_dir: ./output\n\n"
-        "source:\n"
-        "  # Source dataset to process: ngd or abp\n"
-        f"  type: {config['source']['type']}\n\n"
-        "# OS Data Hub download settings\n"
-        "# Data package and version IDs are mandatory and taken from OS Data Hub\n"
-        "# API docs: https://api.os.uk/downloads/v1\n"
-        "os_downloads:\n"
-        "  # Data package ID from OS Data Hub\n"
-        f'  package_id: "{os_downloads["package_id"]}"\n'
-        "  # Version ID (update this when new data is released)\n"
-        f'  version_id: "{os_downloads["version_id"]}"\n\n'
-        "# Processing options\n"
-        "processing:\n"
-        "  # Parquet compression codec for intermediate/final files\n"
-        f"  parquet_compression: {processing['parquet_compression']}\n"
-        "  # Compression level (higher usually means smaller files but slower writes)\n"
-        f"  parquet_compression_level: {processing['parquet_compression_level']}\n\n"
-        "  # DuckDB memory limit (optional)\n"
-        "  # If set, limits how much RAM DuckDB can use (e.g., '4GB', '500MB')\n"
-        "  # If not set, DuckDB uses its default memory strategy\n"
-        f"{duckdb_memory_limit_line}\n"
-        "  # Number of chunks to split flatfile processing into (default: 1)\n"
-        "  # Use higher values (e.g., 10-20) for lower memory usage\n"
-        f"  num_chunks: {processing['num_chunks']}\n"
+    return _CONFIG_TEMPLATE.format_map(
+        {
+            "work_dir": paths["work_dir"],
+            "source_type": config["source"]["type"],
+            "package_id": os_downloads["package_id"],
+            "version_id": os_downloads["version_id"],
+            "parquet_compression": processing["parquet_compression"],
+            "parquet_compression_level": processing["parquet_compression_level"],
+            "duckdb_memory_limit_line": duckdb_memory_limit_line,
+            "num_chunks": processing["num_chunks"],
+        }
     )
 
 
+def _fresh_defaults() -> dict[str, object]:
+    """Independent deep copy of the built-in defaults, safe to mutate."""
+    return copy.deepcopy(DEFAULT_CONFIG)
+
+
+def _merge_into(base: dict, loaded: dict) -> None:
+    """Recursively fold loaded config values into the default structure."""
+    for key, value in loaded.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge_into(base[key], value)
+        else:
+            base[key] = value
+
+
 def load_existing_defaults(config_path: Path) -> dict[str, object]:
-    """Load existing config as defaults, merged with built-in defaults."""
-    if not config_path.exists():
-        return DEFAULT_CONFIG.copy()
+    """Load existing config as defaults, merged with built-in defaults.
 
-    with open(config_path) as f:
-        loaded = yaml.safe_load(f) or {}
+    Always returns a structure independent of ``DEFAULT_CONFIG`` so callers
+    can mutate nested sections without corrupting the shared defaults.
+    """
+    merged = _fresh_defaults()
+    if not config_path.exists():
+        return merged
 
-    merged = DEFAULT_CONFIG | loaded
-    loaded_paths = loaded.get("paths") if isinstance(loaded.get("paths"), dict) else {}
-    merged["paths"] = {
-        "work_dir": loaded_paths.get("work_dir", DEFAULT_CONFIG["paths"]["work_dir"]),
-        "overrides": dict(loaded_paths.get("overrides") or {}),
-    }
-    merged["source"] = {**DEFAULT_CONFIG["source"], **(loaded.get("source") or {})}
-    merged["os_downloads"] = {
-        **DEFAULT_CONFIG["os_downloads"],
-        **(loaded.get("os_downloads") or {}),
-    }
-    merged["processing"] = {
-        **DEFAULT_CONFIG["processing"],
-        **(loaded.get("processing") or {}),
-    }
+    loaded = _read_yaml_cached(config_path) or {}
+    if isinstance(loaded, dict) and loaded:
+        _merge_into(merged, loaded)
     return merged
 
 
+def _atomic_write_text(path: Path, data: str) -> bool:
+    """Write text to a sibling .tmp file and os.replace it into place.
+
+    Readers never observe a partially-written config/.env, and a crash
+    mid-write leaves the previous file intact. Returns False (and skips the
+    write, preserving the mtime for downstream build caches) when the file
+    already holds identical content.
+    """
+    encoded = data.encode("utf-8")
+    if path.exists():
+        try:
+            existing_digest = hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+        except OSError:
+            existing_digest = None
+        if existing_digest == hashlib.blake2b(encoded, digest_size=16).digest():
+            return False
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8", buffering=65536) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return True
+
+
 def write_env_file(
     path: Path,
     overwrite: bool = False,
@@ -134,11 +189,11 @@ def write_env_file(
         raise ValueError("Both 'api_key' and 'api_secret' must be provided together.")
 
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
+    _atomic_write_text(
+        path,
         "# OS Data Hub API credentials\n"
         f"OS_PROJECT_API_KEY={api_key or 'your_api_key_here'}\n"
         f"OS_PROJECT_API_SECRET={api_secret or 'your_api_secret_here'}\n",
-        encoding="utf-8",
     )
     return True
 
@@ -152,14 +207,23 @@ def write_config_and_env(
     write_env: bool = True,
     api_key: str | None = None,
     api_secret: str | None = None,
+    config_format: Literal["yaml", "json"] = "yaml",
 ) -> tuple[Path, Path, bool]:
-    """Write provided config plus .env template to disk."""
+    """Write provided config plus .env template to disk.
+
+    ``config_format="json"`` writes plain JSON (no annotations), which both
+    parses faster and suits machine-generated configs; YAML stays the default
+    for human editing.
+    """
     config_out_path = Path(config_out).resolve()
     env_out_path = Path(env_out).resolve()
 
     config_out_path.parent.mkdir(parents=True, exist_ok=True)
-    config_text = render_annotated_config(config)
-    config_out_path.write_text(config_text, encoding="utf-8")
+    if config_format == "json":
+        config_text = json.dumps(config, indent=2) + "\n"
+    else:
+        config_text = render_annotated_config(config)
+    config_changed = _atomic_write_text(config_out_path, config_text)
     env_written = False
     if write_env:
         env_written = write_env_file(
@@ -169,7 +233,10 @@ def write_config_and_env(
             api_secret=api_secret,
         )
 
-    logger.info(f"Wrote config for '{config['source']['type']}' to {config_out_path}")
+    if config_changed:
+        logger.info(f"Wrote config for '{config['source']['type']}' to {config_out_path}")
+    else:
+        logger.info(f"Config at {config_out_path} already up to date; write skipped")
     if write_env and env_written:
         logger.info(f"Wrote .env template to {env_out_path}")
     elif write_env:
@@ -224,6 +291,14 @@ def create_config_and_env(
     )
 
 
+def _resolve_override_path(value: str | Path) -> Path:
+    """Resolve a CLI path override without touching the filesystem when absolute."""
+    path = Path(value).expanduser()
+    if path.is_absolute():
+        return path
+    return path.resolve()
+
+
 def apply_run_overrides(
     settings: Settings,
     *,
@@ -241,6 +316,27 @@ def apply_run_overrides(
     parquet_compression_level: int | None = None,
 ) -> None:
     """Apply runtime overrides to loaded settings."""
+    # Common case: plain `ukam-os-build --step ...` supplies no overrides at
+    # all, so skip the field-by-field checks entirely.
+    if not any(
+        value is not None
+        for value in (
+            source,
+            package_id,
+            version_id,
+            work_dir,
+            downloads_dir,
+            extracted_dir,
+            output_dir,
+            schema_path,
+            num_chunks,
+            duckdb_memory_limit,
+            parquet_compression,
+            parquet_compression_level,
+        )
+    ):
+        return
+
     if source:
         settings.source.type = source
 
@@ -250,19 +346,19 @@ def apply_run_overrides(
         settings.os_downloads.version_id = version_id
 
     if work_dir:
-        settings.paths.work_dir = Path(work_dir).resolve()
+        settings.paths.work_dir = _resolve_override_path(work_dir)
         settings.paths.downloads_dir = settings.paths.work_dir / "downloads"
         settings.paths.extracted_dir = settings.paths.work_dir / "extracted"
         settings.paths.parquet_dir = settings.paths.work_dir / "parquet"
         settings.paths.output_dir = settings.paths.work_dir / "output"
     if downloads_dir:
-        settings.paths.downloads_dir = Path(downloads_dir).resolve()
+        settings.paths.downloads_dir = _resolve_override_path(downloads_dir)
     if extracted_dir:
-        settings.paths.extracted_dir = Path(extracted_dir).resolve()
+        settings.paths.extracted_dir = _resolve_override_path(extracted_dir)
     if output_dir:
-        settings.paths.output_dir = Path(output_dir).resolve()
+        settings.paths.output_dir = _resolve_override_path(output_dir)
     if schema_path:
-        settings.paths.schema_path = Path(schema_path).resolve()
+        settings.paths.schema_path = _resolve_override_path(schema_path)
 
     if num_chunks is not None:
         if num_chunks < 1:
@@ -279,6 +375,61 @@ def apply_run_overrides(
         settings.processing.parquet_compression_level = parquet_compression_level
 
 
+# How long a successful API preflight stays valid for the same package,
+# version and credentials before we call OS Data Hub again.
+_API_PREFLIGHT_TTL_SECONDS = 300
+
+
+def _api_preflight_cache_path(settings: Settings) -> Path:
+    return settings.paths.work_dir / ".api_preflight.json"
+
+
+def _api_preflight_fingerprint(settings: Settings) -> str:
+    # Fingerprint the credentials the preflight would actually send (the ones
+    # resolved onto settings), not whatever happens to be in os.environ, so
+    # configs with different credential files never share a cached verdict.
+    api_key = settings.os_downloads.api_key
+    api_secret = settings.os_downloads.api_secret
+    return _credentials_fingerprint(
+        api_key.get_secret_value() if api_key else None,
+        api_secret.get_secret_value() if api_secret else None,
+    )
+
+
+def _api_preflight_is_fresh(settings: Settings) -> bool:
+    """Whether a recent successful preflight covers the current run."""
+    try:
+        payload = json.loads(_api_preflight_cache_path(settings).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    if not isinstance(payload, dict):
+        return False
+    return (
+        payload.get("package_id") == settings.os_downloads.package_id
+        and payload.get("version_id") == settings.os_downloads.version_id
+        and payload.get("credentials") == _api_preflight_fingerprint(settings)
+        and isinstance(payload.get("checked_at"), (int, float))
+        and (time.time() - payload["checked_at"]) < _API_PREFLIGHT_TTL_SECONDS
+    )
+
+
+def _record_api_preflight(settings: Settings) -> None:
+    """Best-effort record of a successful preflight; never stores secrets."""
+    payload = {
+        "checked_at": time.time(),
+        "package_id": settings.os_downloads.package_id,
+        "version_id": settings.os_downloads.version_id,
+        "credentials": _api_preflight_fingerprint(settings),
+    }
+    cache_path = _api_preflight_cache_path(settings)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with cache_path.open("w", encoding="utf-8") as f:
+            json.dump(payload, f)
+    except OSError:
+        pass
+
+
 def run_from_config(
     config_path: str | Path,
     *,
@@ -302,6 +453,7 @@ def run_from_config(
     api_key: str | None = None,
     api_secret: str | None = None,
     check_api: bool = True,
+    force_api_check: bool = False,
 ) -> Any:
     """Load settings from config, apply overrides, and run the pipeline."""
     if list_only and step not in {"download", "all"}:
@@ -345,16 +497,27 @@ def run_from_config(
 
     has_api_key = bool(os.environ.get("OS_PROJECT_API_KEY"))
     if check_api and has_api_key:
-        try:
-            get_package_version(settings)
-        except requests.exceptions.RequestException as exc:
-            if list_only:
-                raise
-            logger.warning(
-                "Could not reach OS Data Hub during API preflight (%s). "
-                "Continuing so local downloads can be used if available.",
-                exc.__class__.__name__,
-            )
+        # A recent successful preflight for the same package/version/credentials
+        # is trusted within the TTL. list_only always re-checks because its
+        # output depends on a live API response.
+        skip_preflight = (
+            not force_api_check and not list_only and _api_preflight_is_fresh(settings)
+        )
+        if skip_preflight:
+            logger.debug("Skipping API preflight: recent successful check found")
+        else:
+            try:
+                get_package_version(settings)
+            except requests.exceptions.RequestException as exc:
+                if list_only:
+                    raise
+                logger.warning(
+                    "Could not reach OS Data Hub during API preflight (%s). "
+                    "Continuing so local downloads can be used if available.",
+                    exc.__class__.__name__,
+                )
+            else:
+                _record_api_preflight(settings)
 
     overwrite_effective = overwrite if overwrite is not None else bool(force)
     run_pipeline(step=step, settings=settings, force=overwrite_effective, list_only=list_only)
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from collections import defaultdict
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from pydantic import ValidationError
-from rich.panel import Panel
 
 from ukam_os_builder.api.settings import SettingsError
 
+if TYPE_CHECKING:
+    from rich.panel import Panel
+
 
 def _build_yaml_snippet_from_missing_paths(missing_paths: list[str]) -> str:
     """Build a minimal YAML snippet showing missing keys."""
@@ -65,4 +68,6 @@ def format_settings_error(exc: SettingsError, *, config_path: Path) -> str:
 
 def render_config_error_panel(message: str) -> Panel:
     """Render a Rich panel for configuration errors."""
+    from rich.panel import Panel
+
     return Panel.fit(message, title="Configuration error", border_style="red")
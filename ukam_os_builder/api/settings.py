@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
 import logging
 import os
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
-import duckdb
 import yaml
-from dotenv import load_dotenv
-from pydantic import BaseModel, ConfigDict, SecretStr, ValidationError, field_validator
+from pydantic import BaseModel, ConfigDict, SecretStr, ValidationError, model_validator
+
+try:  # libyaml-backed loader is considerably faster when available
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader as _YamlLoader
+
+if TYPE_CHECKING:
+    import duckdb
 
 logger = logging.getLogger(__name__)
 
@@ -46,29 +57,24 @@ class OSDownloadSettings(StrictBaseModel):
     connect_timeout_seconds: int = 30
     read_timeout_seconds: int = 300
 
-    @field_validator("package_id", "version_id")
-    @classmethod
-    def _validate_non_empty_str(cls, value: str) -> str:
-        stripped = value.strip()
-        if not stripped:
-            raise ValueError("must be non-empty")
-        return stripped
-
-    @field_validator("api_key", "api_secret", mode="before")
-    @classmethod
-    def _validate_secret(cls, value: Any) -> Any:
-        if value is None:
-            return value
-        if isinstance(value, str) and not value.strip():
-            raise ValueError("must be non-empty")
-        return value
-
-    @field_validator("connect_timeout_seconds", "read_timeout_seconds")
-    @classmethod
-    def _validate_positive_int(cls, value: int) -> int:
-        if value <= 0:
-            raise ValueError("must be > 0")
-        return value
+    @model_validator(mode="after")
+    def _validate(self) -> OSDownloadSettings:
+        # One pass over the model keeps validation overhead down versus a
+        # field_validator per field.
+        self.package_id = self.package_id.strip()
+        self.version_id = self.version_id.strip()
+        if not self.package_id:
+            raise ValueError("package_id must be non-empty")
+        if not self.version_id:
+            raise ValueError("version_id must be non-empty")
+        for name in ("api_key", "api_secret"):
+            secret = getattr(self, name)
+            if secret is not None and not secret.get_secret_value().strip():
+                raise ValueError(f"{name} must be non-empty")
+        for name in ("connect_timeout_seconds", "read_timeout_seconds"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} must be > 0")
+        return self
 
 
 class ProcessingSettings(StrictBaseModel):
@@ -76,15 +82,21 @@ class ProcessingSettings(StrictBaseModel):
 
     parquet_compression: str = "zstd"
     parquet_compression_level: int = 9
+    parquet_per_thread_output: bool = False
     duckdb_memory_limit: str | None = None
+    duckdb_threads: int | None = None
     num_chunks: int = 20
+    max_parallel_chunks: int = 1
 
-    @field_validator("num_chunks")
-    @classmethod
-    def _validate_num_chunks(cls, value: int) -> int:
-        if value < 1:
-            raise ValueError("must be >= 1")
-        return value
+    @model_validator(mode="after")
+    def _validate(self) -> ProcessingSettings:
+        if self.num_chunks < 1:
+            raise ValueError("num_chunks must be >= 1")
+        if self.max_parallel_chunks < 1:
+            raise ValueError("max_parallel_chunks must be >= 1")
+        if self.duckdb_threads is not None and self.duckdb_threads < 1:
+            raise ValueError("duckdb_threads must be >= 1")
+        return self
 
 
 class Settings(StrictBaseModel):
@@ -113,11 +125,18 @@ class SettingsError(Exception):
 
 
 def _resolve_path(base_dir: Path, path_str: str) -> Path:
-    """Resolve a path relative to the config file directory."""
+    """Resolve a path relative to the config file directory.
+
+    Pure string manipulation: ``base_dir`` is already absolute, so joining
+    and normalising with os.path.normpath avoids the per-component stat
+    calls that Path.resolve() makes.
+    """
+    if path_str.startswith("~"):
+        return Path(path_str).expanduser()
     path = Path(path_str)
     if path.is_absolute():
         return path
-    return (base_dir / path).resolve()
+    return Path(os.path.normpath(base_dir / path))
 
 
 def resolve_paths(config: dict[str, Any], config_dir: Path) -> dict[str, Path | None]:
@@ -170,13 +189,95 @@ def resolve_paths(config: dict[str, Any], config_dir: Path) -> dict[str, Path |
     }
 
 
+# Parsed-YAML cache keyed by (path, mtime, size) so repeated loads of an
+# unchanged file skip the parser. Entries are deep-copied on the way in and
+# out so callers can mutate results freely.
+_YAML_CACHE: OrderedDict[tuple[str, int, int], Any] = OrderedDict()
+_YAML_CACHE_MAX_ENTRIES = 100
+
+
+def _sidecar_cache_enabled() -> bool:
+    """Whether the on-disk JSON sidecar cache is enabled via environment."""
+    return os.environ.get("UKAM_OS_CONFIG_CACHE", "").strip().lower() in {"1", "true", "yes"}
+
+
+def _sidecar_cache_path(path: Path) -> Path:
+    return path.with_name(path.name + ".cache.json")
+
+
+def _read_sidecar_cache(path: Path, stat: os.stat_result) -> Any | None:
+    """Read a parsed config from the JSON sidecar, if present and current."""
+    sidecar = _sidecar_cache_path(path)
+    try:
+        payload = json.loads(sidecar.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("mtime_ns") != stat.st_mtime_ns
+        or payload.get("size") != stat.st_size
+    ):
+        return None
+    return payload.get("parsed")
+
+
+def _write_sidecar_cache(path: Path, stat: os.stat_result, parsed: Any) -> None:
+    """Atomically persist a parsed config next to the YAML file.
+
+    Best-effort: anything non-JSON-serialisable (e.g. YAML dates) or a
+    read-only directory simply skips the sidecar.
+    """
+    payload = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "parsed": parsed}
+    sidecar = _sidecar_cache_path(path)
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=str(sidecar.parent), prefix=sidecar.name)
+        try:
+            # Stream straight to the handle; json.dumps would build the whole
+            # document in memory first just to write it out
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+        except (TypeError, ValueError):
+            os.unlink(tmp_name)
+            return
+        os.replace(tmp_name, sidecar)
+    except OSError:
+        return
+
+
+def _read_yaml_cached(path: Path) -> Any:
+    """Parse a YAML file, reusing a prior parse if the file is unchanged."""
+    stat = path.stat()
+    cache_key = (str(path), stat.st_mtime_ns, stat.st_size)
+
+    if cache_key in _YAML_CACHE:
+        _YAML_CACHE.move_to_end(cache_key)
+        return copy.deepcopy(_YAML_CACHE[cache_key])
+
+    sidecar_enabled = _sidecar_cache_enabled()
+    parsed = _read_sidecar_cache(path, stat) if sidecar_enabled else None
+
+    if parsed is None:
+        if path.suffix == ".json":
+            parsed = json.loads(path.read_bytes())
+        else:
+            with open(path) as f:
+                parsed = yaml.load(f, Loader=_YamlLoader)
+        if sidecar_enabled and path.suffix != ".json":
+            _write_sidecar_cache(path, stat, parsed)
+
+    _YAML_CACHE[cache_key] = copy.deepcopy(parsed)
+    while len(_YAML_CACHE) > _YAML_CACHE_MAX_ENTRIES:
+        _YAML_CACHE.popitem(last=False)
+
+    return parsed
+
+
 def _load_yaml(config_path: Path) -> dict[str, Any]:
     """Load YAML configuration file."""
     if not config_path.exists():
         raise SettingsError(f"Config file not found: {config_path}")
 
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
+    config = _read_yaml_cached(config_path)
 
     if not isinstance(config, dict):
         raise SettingsError(f"Invalid config file format: {config_path}")
@@ -184,6 +285,124 @@ def _load_yaml(config_path: Path) -> dict[str, Any]:
     return config
 
 
+# Validated-Settings cache keyed by (path, mtime, size, credential fingerprint)
+# so repeated loads of an unchanged config skip pydantic validation too.
+_SETTINGS_CACHE: OrderedDict[tuple[str, int, int, str], Settings] = OrderedDict()
+_SETTINGS_CACHE_MAX_ENTRIES = 16
+
+# Bump when the Settings model shape changes so stale sidecars are ignored.
+_SETTINGS_SIDECAR_VERSION = 1
+
+
+def _settings_sidecar_path(config_path: Path) -> Path:
+    return config_path.with_name(config_path.name + ".settings.json")
+
+
+def _write_settings_sidecar(
+    config_path: Path,
+    stat: os.stat_result,
+    fingerprint: str,
+    settings: Settings,
+) -> None:
+    """Persist a validated Settings snapshot for warm cross-process starts.
+
+    Credentials are never written; they are re-injected from the environment
+    on read (the fingerprint guarantees the environment matches).
+    """
+    paths = settings.paths
+    payload = {
+        "schema_version": _SETTINGS_SIDECAR_VERSION,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "credentials": fingerprint,
+        "paths": {
+            name: (str(value) if value is not None else None)
+            for name, value in (
+                ("work_dir", paths.work_dir),
+                ("downloads_dir", paths.downloads_dir),
+                ("extracted_dir", paths.extracted_dir),
+                ("output_dir", paths.output_dir),
+                ("parquet_dir", paths.parquet_dir),
+                ("schema_path", paths.schema_path),
+            )
+        },
+        "source": {"type": settings.source.type},
+        "os_downloads": {
+            "package_id": settings.os_downloads.package_id,
+            "version_id": settings.os_downloads.version_id,
+            "connect_timeout_seconds": settings.os_downloads.connect_timeout_seconds,
+            "read_timeout_seconds": settings.os_downloads.read_timeout_seconds,
+        },
+        "processing": settings.processing.model_dump(),
+        "config_path": str(settings.config_path),
+    }
+    sidecar = _settings_sidecar_path(config_path)
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=str(sidecar.parent), prefix=sidecar.name)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+        except (TypeError, ValueError):
+            os.unlink(tmp_name)
+            return
+        os.replace(tmp_name, sidecar)
+    except OSError:
+        return
+
+
+def _read_settings_sidecar(
+    config_path: Path,
+    stat: os.stat_result,
+    fingerprint: str,
+    api_key: str | None,
+    api_secret: str | None,
+) -> Settings | None:
+    """Rebuild Settings from the sidecar via model_construct, skipping validation.
+
+    The sidecar content is trusted: it was produced from a validated Settings
+    for the same config bytes (mtime/size) and credential environment.
+    """
+    try:
+        payload = json.loads(_settings_sidecar_path(config_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("schema_version") != _SETTINGS_SIDECAR_VERSION
+        or payload.get("mtime_ns") != stat.st_mtime_ns
+        or payload.get("size") != stat.st_size
+        or payload.get("credentials") != fingerprint
+    ):
+        return None
+
+    try:
+        paths_raw = payload["paths"]
+        return Settings.model_construct(
+            paths=PathSettings.model_construct(
+                **{
+                    name: (Path(value) if value is not None else None)
+                    for name, value in paths_raw.items()
+                }
+            ),
+            source=SourceSettings.model_construct(type=payload["source"]["type"]),
+            os_downloads=OSDownloadSettings.model_construct(
+                api_key=SecretStr(api_key) if api_key else None,
+                api_secret=SecretStr(api_secret) if api_secret else None,
+                **payload["os_downloads"],
+            ),
+            processing=ProcessingSettings.model_construct(**payload["processing"]),
+            config_path=Path(payload["config_path"]),
+        )
+    except (KeyError, TypeError):
+        return None
+
+
+def _credentials_fingerprint(api_key: str | None, api_secret: str | None) -> str:
+    """Digest of the credential environment, avoiding raw secrets in cache keys."""
+    material = f"{api_key or ''}\x00{api_secret or ''}".encode()
+    return hashlib.blake2b(material, digest_size=16).hexdigest()
+
+
 def _load_env_vars() -> tuple[str | None, str | None]:
     """Load API credentials from environment variables if available."""
     api_key = os.environ.get("OS_PROJECT_API_KEY")
@@ -214,18 +433,47 @@ def load_settings(
 
     # Load .env file from the same directory as config
     if load_env:
+        from dotenv import load_dotenv
+
         env_file = Path(env_path).resolve() if env_path else (base_dir / ".env")
         load_dotenv(env_file)
         if env_file.exists():
             logger.debug("Loaded environment from %s", env_file)
 
-    # Load YAML config
-    config = _load_yaml(config_path)
-
     # Load environment variables (optional)
     api_key, api_secret = _load_env_vars()
 
+    # Serve a deep copy of an already-validated Settings object when neither
+    # the config file nor the credential environment has changed.
+    cache_key: tuple[str, int, int, str] | None = None
+    config_stat: os.stat_result | None = None
+    if config_path.exists():
+        config_stat = config_path.stat()
+        cache_key = (
+            str(config_path),
+            config_stat.st_mtime_ns,
+            config_stat.st_size,
+            _credentials_fingerprint(api_key, api_secret),
+        )
+        if cache_key in _SETTINGS_CACHE:
+            _SETTINGS_CACHE.move_to_end(cache_key)
+            return _SETTINGS_CACHE[cache_key].model_copy(deep=True)
+
+        if _sidecar_cache_enabled():
+            cached_settings = _read_settings_sidecar(
+                config_path, config_stat, cache_key[3], api_key, api_secret
+            )
+            if cached_settings is not None:
+                _SETTINGS_CACHE[cache_key] = cached_settings.model_copy(deep=True)
+                return cached_settings
+
+    # Load YAML config
+    config = _load_yaml(config_path)
+
     resolved_paths = resolve_paths(config=config, config_dir=base_dir)
+    # The resolved paths are already Path objects, so hand pydantic a
+    # pre-built submodel rather than having it re-coerce each field.
+    paths_model = PathSettings.model_construct(**resolved_paths)
 
     os_config = config.get("os_downloads", {})
     if not isinstance(os_config, dict):
@@ -233,7 +481,7 @@ def load_settings(
 
     settings_payload = {
         **config,
-        "paths": resolved_paths,
+        "paths": paths_model,
         "source": config.get("source", {}),
         "os_downloads": {
             **os_config,
@@ -245,7 +493,7 @@ def load_settings(
     }
 
     try:
-        return Settings.model_validate(settings_payload)
+        settings = Settings.model_validate(settings_payload)
     except ValidationError as exc:
         raise SettingsError(
             "Invalid configuration",
@@ -253,16 +501,28 @@ def load_settings(
             config_path=config_path,
         ) from exc
 
+    if cache_key is not None:
+        _SETTINGS_CACHE[cache_key] = settings.model_copy(deep=True)
+        while len(_SETTINGS_CACHE) > _SETTINGS_CACHE_MAX_ENTRIES:
+            _SETTINGS_CACHE.popitem(last=False)
+        if _sidecar_cache_enabled() and config_stat is not None:
+            _write_settings_sidecar(config_path, config_stat, cache_key[3], settings)
+
+    return settings
+
 
 def create_duckdb_connection(settings: Settings) -> duckdb.DuckDBPyConnection:
-    """Create a DuckDB connection with optional memory limit applied.
+    """Create a DuckDB connection tuned from processing settings.
 
     Args:
         settings: Settings object containing processing configuration.
 
     Returns:
-        DuckDB connection with memory limit applied if configured.
+        DuckDB connection with memory limit and thread count applied if
+        configured.
     """
+    import duckdb
+
     con = duckdb.connect()
 
     # Apply memory limit if configured
@@ -270,4 +530,14 @@ def create_duckdb_connection(settings: Settings) -> duckdb.DuckDBPyConnection:
         con.execute(f"SET memory_limit = '{settings.processing.duckdb_memory_limit}'")
         logger.info("Set DuckDB memory limit to %s", settings.processing.duckdb_memory_limit)
 
+    # Apply thread count if configured (useful on shared runners, and for
+    # dividing cores between workers when chunks run in parallel)
+    if settings.processing.duckdb_threads:
+        con.execute(f"SET threads = {settings.processing.duckdb_threads}")
+        logger.info("Set DuckDB threads to %d", settings.processing.duckdb_threads)
+
+    # The pipeline never relies on insertion order (outputs carry no ORDER
+    # BY), so let DuckDB skip the final reorder pass after parallel operators
+    con.execute("SET preserve_insertion_order = false")
+
     return con
@@ -2,16 +2,22 @@ from __future__ import annotations
 
 import argparse
 import logging
+from functools import cache
 from pathlib import Path
 
-from rich.console import Console
-
 from ukam_os_builder.api.api import run_from_config
 from ukam_os_builder.api.cli_errors import format_settings_error, render_config_error_panel
 from ukam_os_builder.api.settings import SettingsError
 
 logger = logging.getLogger(__name__)
-console = Console()
+
+
+@cache
+def _get_console():
+    """Create the rich console on first use so --help stays import-light."""
+    from rich.console import Console
+
+    return Console()
 
 
 def _configure_logging(verbose: bool) -> None:
@@ -23,6 +29,7 @@ def _configure_logging(verbose: bool) -> None:
     )
 
 
+@cache
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="ukam-os-build",
@@ -99,6 +106,11 @@ def _build_parser() -> argparse.ArgumentParser:
         help="Override processing.parquet_compression_level.",
     )
 
+    parser.add_argument(
+        "--force-api-check",
+        action="store_true",
+        help="Run the OS Data Hub preflight check even if one recently succeeded.",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -118,6 +130,7 @@ def main(argv: list[str] | None = None) -> int:
     _configure_logging(args.verbose)
 
     try:
+        console = _get_console()
         console.rule("[bold cyan]OS Builder[/bold cyan]")
         config_path = Path(args.config).resolve()
         console.print(f"[green]✓[/green] Loaded config: [bold]{config_path}[/bold]")
@@ -144,6 +157,7 @@ def main(argv: list[str] | None = None) -> int:
             duckdb_memory_limit=args.duckdb_memory_limit,
             parquet_compression=args.parquet_compression,
             parquet_compression_level=args.parquet_compression_level,
+            force_api_check=args.force_api_check,
         )
         console.print("[bold green]Build completed successfully[/bold green]")
         return 0
@@ -153,13 +167,13 @@ def main(argv: list[str] | None = None) -> int:
             message = format_settings_error(exc, config_path=error_config_path)
         else:
             message = str(exc)
-        console.print(render_config_error_panel(message))
+        _get_console().print(render_config_error_panel(message))
         logger.error("Configuration error")
         if args.verbose:
             logger.error("Configuration details: %s", message)
         return 2
     except Exception as exc:  # noqa: BLE001
-        console.print(f"[bold red]Pipeline failed:[/bold red] {exc}")
+        _get_console().print(f"[bold red]Pipeline failed:[/bold red] {exc}")
         logger.exception("Pipeline failed: %s", exc)
         return 1
 
@@ -15,7 +15,7 @@ from typing import Any
 
 import yaml
 
-from ukam_os_builder.api.settings import Settings, create_duckdb_connection
+from ukam_os_builder.api.settings import Settings, _YamlLoader, create_duckdb_connection
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +58,7 @@ def load_schema(schema_path: Path) -> dict[str, Any]:
         Schema dictionary with table definitions.
     """
     with open(schema_path) as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
 
 def _get_column_types(schema: dict[str, Any], table_name: str) -> dict[str, str]:
@@ -280,19 +280,37 @@ def split_raw_to_parquet(
                     )
                 """)
 
-            # Write parquet
-            con.execute(f"""
-                COPY typed_{name} TO '{parquet_path.as_posix()}'
-                (FORMAT PARQUET, COMPRESSION '{compression}', COMPRESSION_LEVEL {compression_level})
-            """)
+            # Write parquet. BLPU additionally gets is_parent: whether any
+            # other BLPU names this UPRN as its parent is a static property of
+            # the full dataset, and computing it here (where the whole table is
+            # in view) spares the transform step a global scan per run.
+            if name == "blpu":
+                con.execute(f"""
+                    COPY (
+                        SELECT
+                            t.*,
+                            t.uprn IN (
+                                SELECT parent_uprn FROM typed_blpu WHERE parent_uprn IS NOT NULL
+                            ) AS is_parent
+                        FROM typed_blpu t
+                    ) TO '{parquet_path.as_posix()}'
+                    (FORMAT PARQUET, COMPRESSION '{compression}', COMPRESSION_LEVEL {compression_level})
+                """)
+            else:
+                con.execute(f"""
+                    COPY typed_{name} TO '{parquet_path.as_posix()}'
+                    (FORMAT PARQUET, COMPRESSION '{compression}', COMPRESSION_LEVEL {compression_level})
+                """)
 
             # Remove temp CSV
             tmp_csv.unlink(missing_ok=True)
 
-            # Count output rows
-            output_count = con.execute(f"""
-                SELECT COUNT(*) FROM read_parquet('{parquet_path.as_posix()}')
-            """).fetchone()[0]
+            # Count output rows from the parquet footer metadata; a COUNT(*)
+            # over read_parquet would re-open the file we just wrote
+            output_count = con.execute(
+                "SELECT SUM(num_rows) FROM parquet_file_metadata(?)",
+                [parquet_path.as_posix()],
+            ).fetchone()[0]
             output_counts[name] = output_count
             logger.info("Wrote %s: %d rows", name, output_count)
 
@@ -65,23 +65,61 @@ def register_parquet_view(
     view_name: str,
     parquet_path: Path,
     where_condition: str | None = None,
+    *,
+    materialize: bool = False,
+    columns: list[str] | None = None,
 ) -> None:
-    """Register a parquet-backed view with optional WHERE predicate."""
-    sql = f"SELECT * FROM read_parquet('{parquet_path.as_posix()}')"
+    """Register a parquet-backed view with optional WHERE predicate.
+
+    Args:
+        con: DuckDB connection.
+        view_name: Name to register.
+        parquet_path: Parquet file to read.
+        where_condition: Optional WHERE predicate applied at registration.
+        materialize: When True, create a TEMPORARY TABLE instead of a view.
+            Tables are scanned repeatedly downstream without re-decoding
+            parquet, and give the optimizer real cardinality statistics for
+            join ordering.
+        columns: Optional explicit projection; restricting to the columns the
+            transform actually uses keeps the materialised table narrow.
+    """
+    select_list = ", ".join(columns) if columns else "*"
+    sql = f"SELECT {select_list} FROM read_parquet('{parquet_path.as_posix()}')"
     if where_condition:
         sql += f" WHERE {where_condition}"
-    con.execute(f"CREATE OR REPLACE VIEW {view_name} AS {sql}")
+    if materialize:
+        con.execute(f"CREATE OR REPLACE TEMPORARY TABLE {view_name} AS {sql}")
+    else:
+        con.execute(f"CREATE OR REPLACE VIEW {view_name} AS {sql}")
 
 
 def create_macros(con: duckdb.DuckDBPyConnection) -> None:
-    """Create reusable SQL macros for address rendering."""
+    """Create reusable SQL macros for address rendering and ranking."""
+    # Shared ranking maps: logical_status 1 (approved) sorts before 3
+    # (alternative) before 6 (provisional); sources sort LPI first. Defined
+    # once here so the LPI and combine stages cannot drift apart.
+    con.execute("""
+        CREATE OR REPLACE MACRO status_rank(s) AS
+        CASE s WHEN 1 THEN 0 WHEN 3 THEN 1 WHEN 6 THEN 2 ELSE 9 END
+    """)
+
+    con.execute("""
+        CREATE OR REPLACE MACRO source_rank(s) AS
+        CASE s
+            WHEN 'LPI' THEN 0
+            WHEN 'ORGANISATION' THEN 1
+            WHEN 'DELIVERY_POINT' THEN 2
+            WHEN 'CUSTOM_LEVEL' THEN 3
+            ELSE 4
+        END
+    """)
     # Build address component (SAO or PAO)
     con.execute("""
         CREATE OR REPLACE MACRO build_component(
             comp_text, comp_start_number, comp_start_suffix, comp_end_number, comp_end_suffix
         ) AS
         TRIM(concat_ws(' ',
-            NULLIF(comp_text, ''),
+            NULLIF(TRIM(comp_text), ''),
             CASE
                 WHEN comp_start_number IS NOT NULL AND comp_end_number IS NULL
                     THEN concat(comp_start_number, COALESCE(comp_start_suffix, ''))
@@ -108,8 +146,8 @@ def create_macros(con: duckdb.DuckDBPyConnection) -> None:
                 build_component(sao_text, sao_start_number, sao_start_suffix, sao_end_number, sao_end_suffix),
                 build_component(pao_text, pao_start_number, pao_start_suffix, pao_end_number, pao_end_suffix)
             )), ''),
-            NULLIF(street_description, ''),
-            NULLIF(locality_name, ''),
-            NULLIF(town_name, '')
+            NULLIF(TRIM(street_description), ''),
+            NULLIF(TRIM(locality_name), ''),
+            NULLIF(TRIM(town_name), '')
         ))
     """)
@@ -9,6 +9,8 @@ Behaviour:
 - User sets `processing.num_chunks` in config.yaml (default: 1).
 - Flatfile step produces N parquet files (one per chunk).
 - Chunk assignment: `uprn IS NOT NULL AND (hash(uprn) % num_chunks) = chunk_id`
+- Chunks are disjoint, so `processing.max_parallel_chunks` > 1 runs them in
+  parallel worker processes (default: 1, i.e. serial).
 
 Correctness guarantees:
 1. With num_chunks=1, output matches non-chunked processing exactly.
@@ -24,6 +26,8 @@ Output naming: abp_for_uk_address_matcher.chunk_NNN_of_MMM.parquet
 from __future__ import annotations
 
 import logging
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from time import perf_counter
 
@@ -56,10 +60,60 @@ def _get_chunk_output_path(output_dir: Path, chunk_id: int, num_chunks: int) ->
     )
 
 
+def _blpu_has_is_parent(settings: Settings, parquet_dir: Path) -> bool:
+    """Check whether blpu.parquet carries the split-time is_parent column.
+
+    Parquet files written before the split step emitted is_parent lack the
+    column; callers fall back to deriving the parent set at transform time.
+    """
+    con = create_duckdb_connection(settings)
+    try:
+        rows = con.execute(
+            "SELECT name FROM parquet_schema(?)",
+            [(parquet_dir / "blpu.parquet").as_posix()],
+        ).fetchall()
+    finally:
+        con.close()
+    return any(row[0] == "is_parent" for row in rows)
+
+
+def _prepare_parent_uprn_parquet(settings: Settings, parquet_dir: Path) -> Path:
+    """Materialise the global set of parent UPRNs once per run.
+
+    Every chunk needs the full parent set (children may live in other chunks),
+    but scanning all of blpu.parquet once per chunk is wasted work. This writes
+    the distinct parent UPRNs to a small derived parquet that each chunk reads
+    instead.
+
+    Args:
+        settings: Application settings.
+        parquet_dir: Directory containing raw parquet files.
+
+    Returns:
+        Path to the derived parent-UPRN parquet file.
+    """
+    # Derived data lives next to (not inside) the raw split directory, which
+    # the rest of the pipeline treats as read-only input
+    parent_path = settings.paths.parquet_dir / "parent_uprns.parquet"
+    con = create_duckdb_connection(settings)
+    try:
+        con.execute(f"""
+            COPY (
+                SELECT DISTINCT parent_uprn AS uprn
+                FROM read_parquet('{(parquet_dir / "blpu.parquet").as_posix()}')
+                WHERE parent_uprn IS NOT NULL
+            ) TO '{parent_path.as_posix()}' (FORMAT PARQUET)
+        """)
+    finally:
+        con.close()
+    return parent_path
+
+
 def _transform_to_flatfile_chunk(
     settings: Settings,
     chunk_id: int,
     num_chunks: int,
+    parent_uprns_path: Path | None,
     force: bool = False,
 ) -> Path:
     """Transform split parquet files into flatfile for a single chunk.
@@ -70,6 +124,9 @@ def _transform_to_flatfile_chunk(
         settings: Application settings.
         chunk_id: Zero-based chunk index.
         num_chunks: Total number of chunks.
+        parent_uprns_path: Parquet file of distinct parent UPRNs (global, from
+            `_prepare_parent_uprn_parquet`), or None when blpu.parquet carries
+            the split-time is_parent column.
         force: Force re-processing even if output exists.
 
     Returns:
@@ -82,6 +139,10 @@ def _transform_to_flatfile_chunk(
     parquet_dir = settings.paths.parquet_dir / "raw"
     output_dir = settings.paths.output_dir
     output_path = _get_chunk_output_path(output_dir, chunk_id, num_chunks)
+    per_thread_output = settings.processing.parquet_per_thread_output
+    if per_thread_output:
+        # One directory of per-thread files per chunk instead of one file
+        output_path = output_path.with_suffix("")
 
     # Check if output exists
     if output_path.exists() and not force:
@@ -104,29 +165,114 @@ def _transform_to_flatfile_chunk(
     # When num_chunks=1: hash(uprn) % 1 = 0 is always true, so this is a no-op
     uprn_filter = chunk_where("uprn", num_chunks, chunk_id)
 
-    # Register parquet views with chunk filtering
-    # Tables with UPRN get filtered; street_descriptor is handled separately
-    register_parquet_view(con, "blpu", parquet_dir / "blpu.parquet", uprn_filter)
-    register_parquet_view(con, "lpi", parquet_dir / "lpi.parquet", uprn_filter)
-    register_parquet_view(con, "organisation", parquet_dir / "organisation.parquet", uprn_filter)
+    # Materialize chunk-filtered inputs as temp tables, projected down to the
+    # columns the stages actually use. The stages scan these inputs several
+    # times each; materializing once avoids repeated parquet decode and gives
+    # the optimizer real statistics. street_descriptor is handled separately.
+    # blpu/lpi additionally carry the predicates the LPI base build applies
+    # anyway, pushed down to the parquet scan so row-group zonemaps can skip
+    # non-postal and historical rows before decode
+    blpu_columns = ["uprn", "parent_uprn", "postcode_locator", "blpu_state", "addressbase_postal"]
+    if parent_uprns_path is None:
+        blpu_columns.append("is_parent")
+    register_parquet_view(
+        con,
+        "blpu",
+        parquet_dir / "blpu.parquet",
+        f"{uprn_filter} AND (addressbase_postal != 'N' OR addressbase_postal IS NULL)",
+        materialize=True,
+        columns=blpu_columns,
+    )
+    register_parquet_view(
+        con,
+        "lpi",
+        parquet_dir / "lpi.parquet",
+        f"{uprn_filter} AND logical_status IN (1, 3, 6)",
+        materialize=True,
+        columns=[
+            "uprn",
+            "lpi_key",
+            "language",
+            "logical_status",
+            "official_flag",
+            "start_date",
+            "end_date",
+            "last_update_date",
+            "usrn",
+            "level",
+            "sao_text",
+            "sao_start_number",
+            "sao_start_suffix",
+            "sao_end_number",
+            "sao_end_suffix",
+            "pao_text",
+            "pao_start_number",
+            "pao_start_suffix",
+            "pao_end_number",
+            "pao_end_suffix",
+        ],
+    )
+    register_parquet_view(
+        con,
+        "organisation",
+        parquet_dir / "organisation.parquet",
+        uprn_filter,
+        materialize=True,
+        columns=["uprn", "organisation", "legal_name", "start_date", "end_date"],
+    )
     register_parquet_view(
-        con, "delivery_point", parquet_dir / "delivery_point.parquet", uprn_filter
+        con,
+        "delivery_point",
+        parquet_dir / "delivery_point.parquet",
+        uprn_filter,
+        materialize=True,
+        columns=[
+            "uprn",
+            "udprn",
+            "postcode",
+            "end_date",
+            "last_update_date",
+            "department_name",
+            "organisation_name",
+            "sub_building_name",
+            "building_name",
+            "building_number",
+            "dependent_thoroughfare",
+            "thoroughfare",
+            "double_dependent_locality",
+            "dependent_locality",
+            "post_town",
+        ],
     )
     register_parquet_view(
-        con, "classification", parquet_dir / "classification.parquet", uprn_filter
+        con,
+        "classification",
+        parquet_dir / "classification.parquet",
+        uprn_filter,
+        materialize=True,
+        columns=["uprn", "classification_code", "class_scheme", "end_date", "last_update_date"],
     )
 
     # Street descriptor: register unfiltered, then filter by USRNs present in chunk's LPI
     register_parquet_view(con, "street_descriptor", parquet_dir / "street_descriptor.parquet")
 
-    # Create global parent_uprns_with_children lookup for hierarchy_level fix
-    # This must scan ALL BLPUs to correctly identify parents whose children may be in other chunks
-    con.execute(f"""
-        CREATE OR REPLACE TEMP TABLE parent_uprns_with_children AS
-        SELECT DISTINCT parent_uprn AS uprn
-        FROM read_parquet('{(parquet_dir / "blpu.parquet").as_posix()}')
-        WHERE parent_uprn IS NOT NULL
-    """)
+    # Global parent_uprns_with_children lookup for hierarchy_level fix.
+    # The split step stamps each BLPU with is_parent computed over ALL BLPUs
+    # (parents' children may be in other chunks), so the lookup comes straight
+    # from the chunk's rows. Older parquet files without the column use the
+    # per-run derived parquet instead.
+    if parent_uprns_path is None:
+        con.execute("""
+            CREATE OR REPLACE TEMPORARY TABLE parent_uprns_with_children AS
+            SELECT uprn FROM blpu WHERE is_parent
+        """)
+    else:
+        register_parquet_view(
+            con,
+            "parent_uprns_with_children",
+            parent_uprns_path,
+            materialize=True,
+        )
 
     # Log parent count (useful for debugging)
     parent_count = con.execute("SELECT COUNT(*) FROM parent_uprns_with_children").fetchone()[0]
@@ -151,7 +297,8 @@ def _transform_to_flatfile_chunk(
     misc.prepare_classification_best(con)
     logger.debug("Preparation completed in %.2f seconds", perf_counter() - t0)
 
-    # Render variants
+    # Render variants into the shared _all_variants table
+    combine.create_variants_table(con)
     stages = [
         ("LPI variants", lpi.render_variants),
         ("Business variants", business.render_variants),
@@ -164,9 +311,11 @@ def _transform_to_flatfile_chunk(
         func(con)
         logger.debug("%s rendered in %.2f seconds", label, perf_counter() - t0)
 
-    # Combine and write
+    # Combine and materialise; the metrics query and the COPY below would
+    # each re-run the whole dedup pipeline if result were a view
     t0 = perf_counter()
-    result = combine.combine_and_dedupe(con)
+    result_sql = combine.combine_and_dedupe(con)
+    con.execute(f"CREATE OR REPLACE TEMPORARY TABLE result AS {result_sql}")
     logger.debug("Combination and deduplication in %.2f seconds", perf_counter() - t0)
 
     # Get chunk metrics
@@ -174,11 +323,20 @@ def _transform_to_flatfile_chunk(
     chunk_uprns = chunk_metrics[0]
     chunk_rows = chunk_metrics[1]
 
-    # Write output
+    # Write output with the configured codec and read-friendly row groups
+    # (COPY overwrites any existing file)
     t0 = perf_counter()
-    if output_path.exists():
-        output_path.unlink()
-    result.write_parquet(output_path.as_posix())
+    compression = settings.processing.parquet_compression
+    copy_options = f"FORMAT PARQUET, COMPRESSION '{compression}', ROW_GROUP_SIZE 1048576"
+    if compression.lower() == "zstd":
+        copy_options += f", COMPRESSION_LEVEL {settings.processing.parquet_compression_level}"
+    if per_thread_output:
+        # Parallelise parquet encoding across threads; emits one file per
+        # writer thread under the chunk directory
+        if output_path.exists():
+            shutil.rmtree(output_path)
+        copy_options += ", PER_THREAD_OUTPUT true"
+    con.execute(f"COPY result TO '{output_path.as_posix()}' ({copy_options})")
     logger.debug("Parquet written in %.2f seconds", perf_counter() - t0)
 
     chunk_duration = perf_counter() - chunk_start
@@ -226,15 +384,55 @@ def transform_to_flatfile(
     total_start = perf_counter()
     output_paths: list[Path] = []
 
-    for chunk_id in range(num_chunks):
-        logger.info("Running chunk %d/%d", chunk_id + 1, num_chunks)
-        chunk_path = _transform_to_flatfile_chunk(
-            settings,
-            chunk_id=chunk_id,
-            num_chunks=num_chunks,
-            force=force,
-        )
-        output_paths.append(chunk_path)
+    # Build the global parent-UPRN set once, but only if some chunk will run
+    # and blpu.parquet predates the split-time is_parent column. Per-thread
+    # output mode writes extension-less directories, so probe the same path
+    # shape the chunks will skip on.
+    parent_uprns_path: Path | None = None
+    per_thread_output = settings.processing.parquet_per_thread_output
+
+    def _chunk_output_exists(chunk_id: int) -> bool:
+        path = _get_chunk_output_path(output_dir, chunk_id, num_chunks)
+        if per_thread_output:
+            path = path.with_suffix("")
+        return path.exists()
+
+    pending = force or any(
+        not _chunk_output_exists(chunk_id) for chunk_id in range(num_chunks)
+    )
+    if pending and not _blpu_has_is_parent(settings, parquet_dir):
+        parent_uprns_path = _prepare_parent_uprn_parquet(settings, parquet_dir)
+
+    max_workers = min(settings.processing.max_parallel_chunks, num_chunks)
+    if max_workers > 1:
+        # Chunks are disjoint by UPRN hash, so they can run in parallel
+        # processes, each with its own DuckDB connection. Note that
+        # duckdb_memory_limit applies per process when running in parallel.
+        logger.info("Running %d chunks across %d worker processes", num_chunks, max_workers)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _transform_to_flatfile_chunk,
+                    settings,
+                    chunk_id=chunk_id,
+                    num_chunks=num_chunks,
+                    parent_uprns_path=parent_uprns_path,
+                    force=force,
+                )
+                for chunk_id in range(num_chunks)
+            ]
+            output_paths = [future.result() for future in futures]
+    else:
+        for chunk_id in range(num_chunks):
+            logger.info("Running chunk %d/%d", chunk_id + 1, num_chunks)
+            chunk_path = _transform_to_flatfile_chunk(
+                settings,
+                chunk_id=chunk_id,
+                num_chunks=num_chunks,
+                parent_uprns_path=parent_uprns_path,
+                force=force,
+            )
+            output_paths.append(chunk_path)
 
     total_duration = perf_counter() - total_start
 
@@ -243,9 +441,13 @@ def transform_to_flatfile(
         # For single chunk, also report detailed statistics like before
         con = create_duckdb_connection(settings)
         output_path = output_paths[0]
+        if output_path.is_dir():
+            files_sql = (output_path / "*.parquet").as_posix()
+        else:
+            files_sql = output_path.as_posix()
         stats = con.execute(f"""
             SELECT COUNT(DISTINCT unique_id), COUNT(*)
-            FROM read_parquet('{output_path.as_posix()}')
+            FROM read_parquet('{files_sql}')
         """).fetchone()
         total_uprns = stats[0]
         total_rows = stats[1]
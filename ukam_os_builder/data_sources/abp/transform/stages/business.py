@@ -63,9 +63,10 @@ Key Logic Explained
 The script splits logic into `current_variants` (businesses still there) and
 `historical_variants` (businesses that have left).
 
-For historical records, it uses a "Lateral Join". This is a database technique
-that effectively asks: "For this old business record, find me the address
-version that was active during the dates the business was active."
+For historical records, it asks: "For this old business record, find me the
+address version that was active during the dates the business was active."
+Candidates whose dates overlap an address record are matched via a range join;
+the rest fall back to the best available address for their UPRN.
 """
 
 from __future__ import annotations
@@ -74,82 +75,134 @@ import duckdb
 
 
 def render_variants(con: duckdb.DuckDBPyConnection) -> None:
-    """Create organisation/business name address variants."""
-    con.execute("DROP TABLE IF EXISTS _stage_business_variants")
+    """Insert organisation/business name address variants into _all_variants."""
+    # Materialize the organisation rows once, trimmed and keyed: the current
+    # and historical branches below each read this table, and a plain CTE
+    # would leave the planner free to re-scan organisation per reference.
+    # Rows with no usable name can never produce a variant, so they are
+    # dropped before any join. org_row_id keeps duplicate rows distinct
+    # when ranking.
+    con.execute("DROP TABLE IF EXISTS _org_rows")
     con.execute("""
-        CREATE TEMPORARY TABLE _stage_business_variants AS
-        WITH organisation_clean AS (
+        CREATE TEMPORARY TABLE _org_rows AS
+        SELECT
+            uprn,
+            NULLIF(TRIM(organisation), '') AS org_name,
+            NULLIF(TRIM(legal_name), '') AS legal_name,
+            start_date,
+            end_date,
+            ROW_NUMBER() OVER () AS org_row_id
+        FROM organisation
+        WHERE NULLIF(TRIM(organisation), '') IS NOT NULL
+           OR NULLIF(TRIM(legal_name), '') IS NOT NULL
+    """)
+    # Business UPRNs are a small fraction of all LPI UPRNs; fresh stats let
+    # the optimizer keep the org rows on the build side and push its join
+    # filters into the LPI scans
+    con.execute("ANALYZE _org_rows")
+
+    # Join organisation rows to the LPI once, then fan the trading/legal
+    # names out over the matched address. Both names on a row share the same
+    # UPRN and dates, so they always resolve to the same LPI match; joining
+    # and ranking per row instead of per name halves that work for rows
+    # carrying both names. A legal name is dropped at fan-out when it
+    # duplicates the trading name.
+    con.execute("""
+        INSERT INTO _all_variants
+        WITH current_matched AS (
             SELECT
-                uprn,
-                TRIM(organisation) AS organisation_name,
-                TRIM(legal_name) AS legal_name,
-                start_date,
-                end_date
-            FROM organisation
+                o.uprn, o.org_name, o.legal_name,
+                lb.postcode, lb.base_address, lb.logical_status, lb.official_flag,
+                lb.blpu_state, lb.postal_address_code, lb.parent_uprn, lb.hierarchy_level
+            FROM _org_rows o
+            JOIN lpi_best_current lb ON lb.uprn = o.uprn
+            WHERE o.end_date IS NULL
         ),
-        organisation_candidates AS (
-            SELECT uprn, 'ORGANISATION' AS name_source, organisation_name AS name_value, start_date, end_date
-            FROM organisation_clean
-            WHERE organisation_name IS NOT NULL AND organisation_name <> ''
-            UNION ALL
-            SELECT uprn, 'LEGAL_NAME' AS name_source, legal_name AS name_value, start_date, end_date
-            FROM organisation_clean
-            WHERE legal_name IS NOT NULL AND legal_name <> ''
-              AND (organisation_name IS NULL OR organisation_name <> legal_name)
+        historical_rows AS (
+            SELECT * FROM _org_rows WHERE end_date IS NOT NULL
         ),
-        current_variants AS (
+        -- Preferred branch: rows whose active dates overlap an LPI row,
+        -- matched with true range predicates so DuckDB can plan a range join
+        -- instead of ranking a date-overlap CASE over every (row, LPI) pair.
+        -- The COALESCE bounds reproduce the old NULL handling exactly: an
+        -- open LPI range always overlaps, a NULL organisation start only
+        -- matches an open-ended LPI row.
+        overlap_best AS (
             SELECT
-                oc.uprn,
-                lb.postcode,
-                TRIM(concat_ws(' ', oc.name_value, lb.base_address)) AS raw_address,
-                lb.logical_status,
-                lb.official_flag,
-                lb.blpu_state,
-                lb.postal_address_code,
-                lb.parent_uprn,
-                lb.hierarchy_level,
-                CASE WHEN oc.name_source = 'LEGAL_NAME' THEN 'BUSINESS_CURRENT_LEGAL' ELSE 'BUSINESS_CURRENT' END AS variant_label,
-                FALSE AS is_primary
-            FROM organisation_candidates oc
-            JOIN lpi_best_current lb ON lb.uprn = oc.uprn
-            WHERE oc.end_date IS NULL
+                o.org_row_id, o.uprn, o.org_name, o.legal_name,
+                lb.postcode, lb.base_address, lb.logical_status, lb.official_flag,
+                lb.blpu_state, lb.postal_address_code, lb.parent_uprn, lb.hierarchy_level
+            FROM historical_rows o
+            JOIN lpi_base_distinct lb
+              ON lb.uprn = o.uprn
+             AND o.end_date >= COALESCE(lb.start_date, DATE '0001-01-01')
+             AND COALESCE(o.start_date, DATE '9999-12-31') <= COALESCE(lb.end_date, DATE '9999-12-31')
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY o.org_row_id
+                ORDER BY
+                    lb.status_rank,
+                    COALESCE(lb.last_update_date, DATE '0001-01-01') DESC
+            ) = 1
         ),
-        historical_variants AS (
+        -- Fallback: rows with no overlapping LPI row at all still get the
+        -- best available address for their UPRN, as before.
+        fallback_best AS (
             SELECT
-                oc.uprn,
-                lb.postcode,
-                TRIM(concat_ws(' ', oc.name_value, lb.base_address)) AS raw_address,
-                lb.logical_status,
-                lb.official_flag,
-                lb.blpu_state,
-                lb.postal_address_code,
-                lb.parent_uprn,
-                lb.hierarchy_level,
-                CASE WHEN oc.name_source = 'LEGAL_NAME' THEN 'BUSINESS_HISTORICAL_LEGAL' ELSE 'BUSINESS_HISTORICAL' END AS variant_label,
-                FALSE AS is_primary
-            FROM organisation_candidates oc
-            JOIN LATERAL (
-                SELECT base_address, postcode, logical_status, official_flag, blpu_state,
-                       postal_address_code, parent_uprn, hierarchy_level
-                FROM lpi_base_distinct lb
-                WHERE lb.uprn = oc.uprn
+                o.uprn, o.org_name, o.legal_name,
+                lb.postcode, lb.base_address, lb.logical_status, lb.official_flag,
+                lb.blpu_state, lb.postal_address_code, lb.parent_uprn, lb.hierarchy_level
+            FROM historical_rows o
+            ANTI JOIN overlap_best ob ON ob.org_row_id = o.org_row_id
+            JOIN lpi_base_distinct lb ON lb.uprn = o.uprn
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY o.org_row_id
                 ORDER BY
-                    CASE WHEN (lb.start_date IS NULL OR oc.end_date >= lb.start_date)
-                          AND (lb.end_date IS NULL OR oc.start_date <= lb.end_date) THEN 0 ELSE 1 END,
-                    status_rank,
+                    lb.status_rank,
                     COALESCE(lb.last_update_date, DATE '0001-01-01') DESC
-                LIMIT 1
-            ) lb ON TRUE
-            WHERE oc.end_date IS NOT NULL
+            ) = 1
+        ),
+        matched AS (
+            SELECT 'CURRENT' AS period, * FROM current_matched
+            UNION ALL
+            SELECT 'HISTORICAL' AS period, uprn, org_name, legal_name, postcode, base_address,
+                   logical_status, official_flag, blpu_state, postal_address_code,
+                   parent_uprn, hierarchy_level
+            FROM overlap_best
+            UNION ALL
+            SELECT 'HISTORICAL' AS period, * FROM fallback_best
+        ),
+        fanned_out AS (
+            SELECT
+                *,
+                unnest(list_filter(
+                    [
+                        struct_pack(src := 'ORGANISATION', val := org_name),
+                        struct_pack(src := 'LEGAL_NAME', val := legal_name)
+                    ],
+                    x -> x.val IS NOT NULL
+                         AND NOT (x.src = 'LEGAL_NAME'
+                                  AND org_name IS NOT NULL
+                                  AND org_name = x.val)
+                )) AS cand
+            FROM matched
         )
-        SELECT uprn, postcode, raw_address, 'ORGANISATION' AS source, logical_status,
-               official_flag, blpu_state, postal_address_code, parent_uprn, hierarchy_level,
-               variant_label, is_primary
-        FROM current_variants
-        UNION ALL
-        SELECT uprn, postcode, raw_address, 'ORGANISATION' AS source, logical_status,
-               official_flag, blpu_state, postal_address_code, parent_uprn, hierarchy_level,
-               variant_label, is_primary
-        FROM historical_variants
-        WHERE raw_address IS NOT NULL AND raw_address <> ''
+        SELECT
+            uprn,
+            postcode,
+            TRIM(concat_ws(' ', cand.val, base_address)) AS raw_address,
+            'ORGANISATION' AS source,
+            logical_status,
+            official_flag,
+            blpu_state,
+            postal_address_code,
+            parent_uprn,
+            hierarchy_level,
+            CASE
+                WHEN period = 'CURRENT' AND cand.src = 'LEGAL_NAME' THEN 'BUSINESS_CURRENT_LEGAL'
+                WHEN period = 'CURRENT' THEN 'BUSINESS_CURRENT'
+                WHEN cand.src = 'LEGAL_NAME' THEN 'BUSINESS_HISTORICAL_LEGAL'
+                ELSE 'BUSINESS_HISTORICAL'
+            END AS variant_label,
+            FALSE AS is_primary
+        FROM fanned_out
     """)
@@ -5,61 +5,85 @@ from __future__ import annotations
 import duckdb
 
 
-def combine_and_dedupe(con: duckdb.DuckDBPyConnection) -> duckdb.DuckDBPyRelation:
+def create_variants_table(con: duckdb.DuckDBPyConnection) -> None:
+    """Create the shared _all_variants table the render stages insert into.
+
+    A single insert target avoids materialising four per-stage tables and then
+    copying them all through a UNION ALL; each renderer streams its rows
+    straight into the combined table instead.
+    """
+    con.execute("""
+        CREATE OR REPLACE TEMPORARY TABLE _all_variants (
+            uprn BIGINT,
+            postcode VARCHAR,
+            raw_address VARCHAR,
+            source VARCHAR,
+            logical_status INTEGER,
+            official_flag VARCHAR,
+            blpu_state VARCHAR,
+            postal_address_code VARCHAR,
+            parent_uprn BIGINT,
+            hierarchy_level VARCHAR,
+            variant_label VARCHAR,
+            is_primary BOOLEAN
+        )
+    """)
+
+
+def combine_and_dedupe(con: duckdb.DuckDBPyConnection) -> str:
     """Combine all variant tables and deduplicate.
 
+    Returns the final SELECT as a SQL string so the runner can feed it
+    straight into a native COPY (and choose parquet writer options) without
+    going through a Python Relation object.
+
     Note: Final ORDER BY is omitted to reduce memory usage during chunked
     processing. Parquet readers can sort on read if needed, or downstream
     consumers can handle ordering.
     """
-    # Combine all stage tables
-    con.execute("""
-        CREATE OR REPLACE VIEW _raw_address_variants AS
-        SELECT * FROM _stage_lpi_variants
-        UNION ALL SELECT * FROM _stage_business_variants
-        UNION ALL SELECT * FROM _stage_delivery_point_variants
-        UNION ALL SELECT * FROM _stage_custom_level_variants
-    """)
-
     # Final deduplication and enrichment (no ORDER BY for memory efficiency)
-    return con.sql(r"""
-        WITH normalized AS (
+    return r"""
+        WITH cleaned AS (
+            SELECT *, REPLACE(raw_address, CHR(39), '') AS depunctuated
+            FROM _all_variants
+        ),
+        ranked AS (
             SELECT
                 uprn, postcode,
-                REGEXP_REPLACE(REPLACE(raw_address, CHR(39), ''), '\s+', ' ') AS address_concat,
+                -- Concat inputs are trimmed at source, so runs of whitespace
+                -- are rare (e.g. created by apostrophe removal above); the
+                -- RE2 collapse only runs on rows that actually contain one
+                CASE
+                    WHEN contains(depunctuated, '  ')
+                        THEN REGEXP_REPLACE(depunctuated, '\s+', ' ')
+                    ELSE depunctuated
+                END AS address_concat,
                 source, logical_status, blpu_state, postal_address_code,
-                parent_uprn, hierarchy_level, variant_label, is_primary
-            FROM _raw_address_variants
-        ),
-        ranked AS (
-            SELECT *,
-                CASE logical_status WHEN 1 THEN 0 WHEN 3 THEN 1 WHEN 6 THEN 2 ELSE 9 END AS status_rank,
-                CASE source WHEN 'LPI' THEN 0 WHEN 'ORGANISATION' THEN 1 WHEN 'DELIVERY_POINT' THEN 2 WHEN 'CUSTOM_LEVEL' THEN 3 ELSE 4 END AS source_rank
-            FROM normalized
+                parent_uprn, hierarchy_level, variant_label, is_primary,
+                status_rank(logical_status) AS status_rank,
+                source_rank(source) AS source_rank
+            FROM cleaned
         ),
         deduped AS (
             SELECT *,
                 ROW_NUMBER() OVER (
                     PARTITION BY uprn, address_concat
                     ORDER BY is_primary DESC, status_rank, source_rank, variant_label, source
-                ) AS rn
+                ) AS rn,
+                -- Safe to count before the rn = 1 filter: dedup keeps the row
+                -- with the highest is_primary per (uprn, address_concat), so
+                -- "any primary" is unchanged by the filter
+                SUM(CASE WHEN is_primary THEN 1 ELSE 0 END) OVER (PARTITION BY uprn) AS primary_count
             FROM ranked
         ),
-        deduped_filtered AS (
-            SELECT uprn, postcode, address_concat, source, logical_status, blpu_state,
-                   postal_address_code, parent_uprn, hierarchy_level, variant_label, is_primary
-            FROM deduped WHERE rn = 1
-        ),
         source_ranked AS (
             SELECT *,
-                SUM(CASE WHEN is_primary THEN 1 ELSE 0 END) OVER (PARTITION BY uprn) AS primary_count,
                 ROW_NUMBER() OVER (
                     PARTITION BY uprn
-                    ORDER BY
-                        CASE source WHEN 'LPI' THEN 0 WHEN 'ORGANISATION' THEN 1 WHEN 'DELIVERY_POINT' THEN 2 WHEN 'CUSTOM_LEVEL' THEN 3 ELSE 4 END,
-                        variant_label, address_concat
+                    ORDER BY source_rank, variant_label, address_concat
                 ) AS uprn_rank
-            FROM deduped_filtered
+            FROM deduped
+            WHERE rn = 1
         )
         SELECT
             sr.uprn AS unique_id,
@@ -78,4 +102,4 @@ def combine_and_dedupe(con: duckdb.DuckDBPyConnection) -> duckdb.DuckDBPyRelatio
         FROM source_ranked sr
         LEFT JOIN classification_best cb ON cb.uprn = sr.uprn
         LEFT JOIN delivery_point_best dp ON dp.uprn = sr.uprn
-    """)
+    """
@@ -94,7 +94,12 @@ def prepare_street_descriptor_views(
     con: duckdb.DuckDBPyConnection,
     usrn_filter_view: str,
 ) -> None:
-    """Create best street descriptor views (by language and any).
+    """Create best street descriptor lookup tables (by language and any).
+
+    Both lookups are materialised as temp tables rather than views: the
+    ROW_NUMBER window over street_descriptor would otherwise be recomputed
+    for each join in `prepare_lpi_base`. An index on the join key lets the
+    two LEFT JOINs from LPI probe directly.
 
     Args:
         con: DuckDB connection.
@@ -104,7 +109,7 @@ def prepare_street_descriptor_views(
     """
     # Best by language - filtered to USRNs in chunk
     con.execute(f"""
-        CREATE OR REPLACE TEMP VIEW _sd_best_by_lang AS
+        CREATE OR REPLACE TEMPORARY TABLE _sd_best_by_lang AS
         SELECT sd_ranked.*
         FROM (
             SELECT sd.*,
@@ -120,9 +125,11 @@ def prepare_street_descriptor_views(
         WHERE rn = 1
     """)
 
+    con.execute("CREATE INDEX idx_sd_lang ON _sd_best_by_lang (usrn, language)")
+
     # Best any language - filtered to USRNs in chunk
     con.execute(f"""
-        CREATE OR REPLACE TEMP VIEW _sd_best_any AS
+        CREATE OR REPLACE TEMPORARY TABLE _sd_best_any AS
         SELECT sd_ranked.*
         FROM (
             SELECT sd.*,
@@ -138,6 +145,8 @@ def prepare_street_descriptor_views(
         WHERE rn = 1
     """)
 
+    con.execute("CREATE INDEX idx_sd_any ON _sd_best_any (usrn)")
+
 
 def prepare_lpi_base(con: duckdb.DuckDBPyConnection) -> None:
     """Create materialised LPI base tables with address components.
@@ -146,59 +155,127 @@ def prepare_lpi_base(con: duckdb.DuckDBPyConnection) -> None:
     exists in the connection. In chunked mode, this table is created from the
     full BLPU dataset to correctly identify parent UPRNs even when their
     children are in different chunks.
+
+    The dedup and best-current ranks are computed as window columns in the
+    single lpi_base_full pass; `lpi_base_distinct` and `lpi_best_current` are
+    then just filtering views over it, rather than separate materialisations
+    that each re-scan and re-sort the previous table.
     """
     con.execute("DROP TABLE IF EXISTS lpi_base_full")
     con.execute("""
         CREATE TEMPORARY TABLE lpi_base_full AS
-        SELECT
-            l.uprn,
-            l.lpi_key,
-            l.language,
-            l.logical_status,
-            l.official_flag,
-            l.start_date,
-            l.end_date,
-            l.last_update_date,
-            b.postcode_locator AS postcode,
-            b.blpu_state,
-            b.addressbase_postal AS postal_address_code,
-            b.parent_uprn,
-            CASE
-                WHEN b.parent_uprn IS NOT NULL THEN 'C'
-                WHEN hc.uprn IS NOT NULL THEN 'P'
-                ELSE 'S'
-            END AS hierarchy_level,
-            l.level,
-            COALESCE(sd_lang.street_description, sd_any.street_description) AS street_description,
-            COALESCE(sd_lang.locality, sd_any.locality) AS locality_name,
-            COALESCE(sd_lang.town_name, sd_any.town_name) AS town_name,
-            build_base_address(
+        WITH joined AS (
+            SELECT
+                l.uprn,
+                l.lpi_key,
+                l.language,
+                l.logical_status,
+                l.official_flag,
+                l.start_date,
+                l.end_date,
+                l.last_update_date,
+                b.postcode_locator AS postcode,
+                b.blpu_state,
+                b.addressbase_postal AS postal_address_code,
+                b.parent_uprn,
+                CASE
+                    WHEN b.parent_uprn IS NOT NULL THEN 'C'
+                    WHEN hc.uprn IS NOT NULL THEN 'P'
+                    ELSE 'S'
+                END AS hierarchy_level,
+                l.level,
                 l.sao_text, l.sao_start_number, l.sao_start_suffix, l.sao_end_number, l.sao_end_suffix,
                 l.pao_text, l.pao_start_number, l.pao_start_suffix, l.pao_end_number, l.pao_end_suffix,
-                COALESCE(sd_lang.street_description, sd_any.street_description),
-                COALESCE(sd_lang.locality, sd_any.locality),
-                COALESCE(sd_lang.town_name, sd_any.town_name)
-            ) AS base_address,
-            CASE l.logical_status
-                WHEN 1 THEN 0
-                WHEN 3 THEN 1
-                WHEN 6 THEN 2
-                ELSE 9
-            END AS status_rank
-        FROM lpi l
-        JOIN blpu b ON b.uprn = l.uprn
-        LEFT JOIN parent_uprns_with_children hc ON hc.uprn = l.uprn
-        LEFT JOIN _sd_best_by_lang sd_lang ON sd_lang.usrn = l.usrn AND sd_lang.language = l.language
-        LEFT JOIN _sd_best_any sd_any ON sd_any.usrn = l.usrn
-        WHERE (b.addressbase_postal != 'N' OR b.addressbase_postal IS NULL)
-          AND l.logical_status IN (1, 3, 6)
+                COALESCE(sd_lang.street_description, sd_any.street_description) AS street_description,
+                COALESCE(sd_lang.locality, sd_any.locality) AS locality_name,
+                COALESCE(sd_lang.town_name, sd_any.town_name) AS town_name,
+                status_rank(l.logical_status) AS status_rank
+            FROM lpi l
+            JOIN blpu b ON b.uprn = l.uprn
+            LEFT JOIN parent_uprns_with_children hc ON hc.uprn = l.uprn
+            LEFT JOIN _sd_best_by_lang sd_lang ON sd_lang.usrn = l.usrn AND sd_lang.language = l.language
+            LEFT JOIN _sd_best_any sd_any ON sd_any.usrn = l.usrn
+            WHERE (b.addressbase_postal != 'N' OR b.addressbase_postal IS NULL)
+              AND l.logical_status IN (1, 3, 6)
+        ),
+        -- SAO/PAO/street components repeat heavily across LPI rows, so the
+        -- string assembly runs once per distinct component tuple and is joined
+        -- back, rather than once per LPI row
+        built AS (
+            SELECT
+                *,
+                build_base_address(
+                    sao_text, sao_start_number, sao_start_suffix, sao_end_number, sao_end_suffix,
+                    pao_text, pao_start_number, pao_start_suffix, pao_end_number, pao_end_suffix,
+                    street_description, locality_name, town_name
+                ) AS base_address
+            FROM (
+                SELECT DISTINCT
+                    sao_text, sao_start_number, sao_start_suffix, sao_end_number, sao_end_suffix,
+                    pao_text, pao_start_number, pao_start_suffix, pao_end_number, pao_end_suffix,
+                    street_description, locality_name, town_name
+                FROM joined
+            )
+        )
+        SELECT
+            j.uprn,
+            j.lpi_key,
+            j.language,
+            j.logical_status,
+            j.official_flag,
+            j.start_date,
+            j.end_date,
+            j.last_update_date,
+            j.postcode,
+            j.blpu_state,
+            j.postal_address_code,
+            j.parent_uprn,
+            j.hierarchy_level,
+            j.level,
+            j.street_description,
+            j.locality_name,
+            j.town_name,
+            c.base_address,
+            j.status_rank,
+            -- Representative row per distinct address tuple (same key set the
+            -- old SELECT DISTINCT used; rows differing only in lpi_key,
+            -- language or street text share a partition)
+            ROW_NUMBER() OVER (
+                PARTITION BY
+                    j.uprn, c.base_address, j.postcode, j.logical_status, j.official_flag,
+                    j.blpu_state, j.postal_address_code, j.parent_uprn, j.hierarchy_level,
+                    j.start_date, j.end_date, j.last_update_date
+            ) AS dedup_rn,
+            -- Best current LPI per UPRN; empty addresses sort last so they can
+            -- never win over a usable one
+            ROW_NUMBER() OVER (
+                PARTITION BY j.uprn
+                ORDER BY
+                    (c.base_address IS NULL OR c.base_address = ''),
+                    j.status_rank,
+                    COALESCE(j.last_update_date, DATE '0001-01-01') DESC
+            ) AS best_current_rn
+        FROM joined j
+        JOIN built c
+          ON j.sao_text IS NOT DISTINCT FROM c.sao_text
+         AND j.sao_start_number IS NOT DISTINCT FROM c.sao_start_number
+         AND j.sao_start_suffix IS NOT DISTINCT FROM c.sao_start_suffix
+         AND j.sao_end_number IS NOT DISTINCT FROM c.sao_end_number
+         AND j.sao_end_suffix IS NOT DISTINCT FROM c.sao_end_suffix
+         AND j.pao_text IS NOT DISTINCT FROM c.pao_text
+         AND j.pao_start_number IS NOT DISTINCT FROM c.pao_start_number
+         AND j.pao_start_suffix IS NOT DISTINCT FROM c.pao_start_suffix
+         AND j.pao_end_number IS NOT DISTINCT FROM c.pao_end_number
+         AND j.pao_end_suffix IS NOT DISTINCT FROM c.pao_end_suffix
+         AND j.street_description IS NOT DISTINCT FROM c.street_description
+         AND j.locality_name IS NOT DISTINCT FROM c.locality_name
+         AND j.town_name IS NOT DISTINCT FROM c.town_name
     """)
 
     # Deduplicated distinct addresses
-    con.execute("DROP TABLE IF EXISTS lpi_base_distinct")
     con.execute("""
-        CREATE TEMPORARY TABLE lpi_base_distinct AS
-        SELECT DISTINCT
+        CREATE OR REPLACE TEMP VIEW lpi_base_distinct AS
+        SELECT
             uprn,
             base_address,
             postcode,
@@ -213,43 +290,35 @@ def prepare_lpi_base(con: duckdb.DuckDBPyConnection) -> None:
             last_update_date,
             status_rank
         FROM lpi_base_full
-        WHERE base_address IS NOT NULL AND base_address <> ''
+        WHERE dedup_rn = 1
+          AND base_address IS NOT NULL AND base_address <> ''
     """)
 
     # Best current LPI per UPRN
-    con.execute("DROP TABLE IF EXISTS lpi_best_current")
     con.execute("""
-        CREATE TEMPORARY TABLE lpi_best_current AS
-        SELECT *
-        FROM (
-            SELECT
-                uprn,
-                base_address,
-                postcode,
-                logical_status,
-                official_flag,
-                blpu_state,
-                postal_address_code,
-                parent_uprn,
-                hierarchy_level,
-                status_rank,
-                last_update_date,
-                ROW_NUMBER() OVER (
-                    PARTITION BY uprn
-                    ORDER BY status_rank, COALESCE(last_update_date, DATE '0001-01-01') DESC
-                ) AS rn
-            FROM lpi_base_distinct
-            WHERE logical_status IN (1, 3, 6)
-        )
-        WHERE rn = 1
+        CREATE OR REPLACE TEMP VIEW lpi_best_current AS
+        SELECT
+            uprn,
+            base_address,
+            postcode,
+            logical_status,
+            official_flag,
+            blpu_state,
+            postal_address_code,
+            parent_uprn,
+            hierarchy_level,
+            status_rank,
+            last_update_date
+        FROM lpi_base_full
+        WHERE best_current_rn = 1
+          AND base_address IS NOT NULL AND base_address <> ''
     """)
 
 
 def render_variants(con: duckdb.DuckDBPyConnection) -> None:
-    """Create LPI-based address variants."""
-    con.execute("DROP TABLE IF EXISTS _stage_lpi_variants")
+    """Insert LPI-based address variants into _all_variants."""
     con.execute("""
-        CREATE TEMPORARY TABLE _stage_lpi_variants AS
+        INSERT INTO _all_variants
         SELECT
             uprn,
             postcode,
@@ -68,56 +68,56 @@ def prepare_classification_best(con: duckdb.DuckDBPyConnection) -> None:
     con.execute("DROP TABLE IF EXISTS classification_best")
     con.execute("""
         CREATE TEMPORARY TABLE classification_best AS
-        SELECT *
-        FROM (
-            SELECT
-                uprn,
-                classification_code,
-                class_scheme,
-                ROW_NUMBER() OVER (
-                    PARTITION BY uprn
-                    ORDER BY
-                        CASE WHEN class_scheme = 'AddressBase Premium Classification Scheme' THEN 0 ELSE 1 END,
-                        COALESCE(end_date, DATE '9999-12-31') DESC,
-                        COALESCE(last_update_date, DATE '0001-01-01') DESC
-                ) AS rn
-            FROM classification
-        )
-        WHERE rn = 1
+        SELECT
+            uprn,
+            classification_code,
+            class_scheme
+        FROM classification
+        QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY uprn
+            ORDER BY
+                CASE WHEN class_scheme = 'AddressBase Premium Classification Scheme' THEN 0 ELSE 1 END,
+                COALESCE(end_date, DATE '9999-12-31') DESC,
+                COALESCE(last_update_date, DATE '0001-01-01') DESC
+        ) = 1
     """)
 
+    # One row per UPRN by construction; the ART index lets the final combine
+    # join probe it instead of building a hash table
+    con.execute("CREATE UNIQUE INDEX idx_classification_best_uprn ON classification_best (uprn)")
+
 
 def render_custom_levels(con: duckdb.DuckDBPyConnection) -> None:
-    """Create custom level-based address variants."""
-    con.execute("DROP TABLE IF EXISTS _stage_custom_level_variants")
+    """Insert custom level-based address variants into _all_variants."""
     con.execute("""
-        CREATE TEMPORARY TABLE _stage_custom_level_variants AS
+        INSERT INTO _all_variants
         WITH level_parsed AS (
             SELECT
                 uprn, postcode, base_address,
-                CASE
-                    WHEN split_part(level, ',', 1) ~ '^-?[0-9]+$'
-                        THEN CAST(split_part(level, ',', 1) AS INTEGER)
-                    ELSE NULL
-                END AS level_int
+                -- TRY_CAST yields NULL on non-numeric input without the
+                -- per-row regex match the old guard used
+                TRY_CAST(split_part(level, ',', 1) AS INTEGER) AS level_int
             FROM lpi_base_full
             WHERE level IS NOT NULL AND base_address IS NOT NULL AND base_address <> ''
         ),
+        -- Joining the mapping table both translates and filters in one hash
+        -- probe: levels outside -1..6 simply find no match
+        level_map(level_int, level_word) AS (
+            VALUES
+                (-1, 'BASEMENT'),
+                (0, 'GROUND'),
+                (1, 'FIRST'),
+                (2, 'SECOND'),
+                (3, 'THIRD'),
+                (4, 'FOURTH'),
+                (5, 'FIFTH'),
+                (6, 'SIXTH')
+        ),
         level_words AS (
             SELECT
-                uprn, postcode, base_address,
-                CASE level_int
-                    WHEN -1 THEN 'BASEMENT'
-                    WHEN 0 THEN 'GROUND'
-                    WHEN 1 THEN 'FIRST'
-                    WHEN 2 THEN 'SECOND'
-                    WHEN 3 THEN 'THIRD'
-                    WHEN 4 THEN 'FOURTH'
-                    WHEN 5 THEN 'FIFTH'
-                    WHEN 6 THEN 'SIXTH'
-                END AS level_word
+                uprn, postcode, base_address, level_word
             FROM level_parsed
-            WHERE level_int BETWEEN -1 AND 6
+            JOIN level_map USING (level_int)
         )
         SELECT
             uprn,
@@ -133,5 +133,4 @@ def render_custom_levels(con: duckdb.DuckDBPyConnection) -> None:
             'CUSTOM_LEVEL' AS variant_label,
             FALSE AS is_primary
         FROM level_words
-        WHERE level_word IS NOT NULL
     """)
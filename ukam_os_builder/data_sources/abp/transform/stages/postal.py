@@ -68,48 +68,86 @@ import duckdb
 def prepare_best_delivery(con: duckdb.DuckDBPyConnection) -> None:
     """Create best delivery point per UPRN."""
     con.execute("DROP TABLE IF EXISTS delivery_point_best")
+    # Top-1-per-UPRN as a hash aggregate rather than a window: MAX over a
+    # struct compares fields lexicographically in declaration order, so the
+    # ranking keys come first and udprn breaks exact ties deterministically
     con.execute("""
         CREATE TEMPORARY TABLE delivery_point_best AS
-        SELECT *
-        FROM (
-            SELECT
-                uprn,
-                udprn,
-                ROW_NUMBER() OVER (
-                    PARTITION BY uprn
-                    ORDER BY
-                        COALESCE(end_date, DATE '9999-12-31') DESC,
-                        COALESCE(last_update_date, DATE '0001-01-01') DESC
-                ) AS rn
-            FROM delivery_point
-            WHERE udprn IS NOT NULL
-        )
-        WHERE rn = 1
+        SELECT
+            uprn,
+            (MAX(struct_pack(
+                end_date_key := COALESCE(end_date, DATE '9999-12-31'),
+                last_update_key := COALESCE(last_update_date, DATE '0001-01-01'),
+                udprn := udprn
+            ))).udprn AS udprn
+        FROM delivery_point
+        WHERE udprn IS NOT NULL
+        GROUP BY uprn
     """)
 
+    # One row per UPRN by construction; the ART index lets the final combine
+    # join probe it instead of building a hash table
+    con.execute("CREATE UNIQUE INDEX idx_delivery_point_best_uprn ON delivery_point_best (uprn)")
+
 
 def render_variants(con: duckdb.DuckDBPyConnection) -> None:
-    """Create Royal Mail delivery point address variants."""
-    con.execute("DROP TABLE IF EXISTS _stage_delivery_point_variants")
+    """Insert Royal Mail delivery point address variants into _all_variants."""
     con.execute("""
-        CREATE TEMPORARY TABLE _stage_delivery_point_variants AS
-        WITH delivery_rendered AS (
-            SELECT
+        INSERT INTO _all_variants
+        -- Historical delivery rows often repeat the same address text with
+        -- different dates; concatenate each distinct field tuple once rather
+        -- than once per row. The combine stage dedupes per (uprn, address)
+        -- anyway, so this only removes work, never output.
+        WITH delivery_distinct AS (
+            SELECT DISTINCT
                 d.uprn,
-                d.postcode AS postcode,
-                TRIM(concat_ws(' ',
-                    NULLIF(TRIM(concat_ws(' ',
-                        d.department_name, d.organisation_name, d.sub_building_name,
-                        d.building_name, d.building_number
-                    )), ''),
-                    NULLIF(d.dependent_thoroughfare, ''),
-                    NULLIF(d.thoroughfare, ''),
-                    NULLIF(d.double_dependent_locality, ''),
-                    NULLIF(d.dependent_locality, ''),
-                    NULLIF(d.post_town, '')
-                )) AS raw_address
+                d.postcode,
+                d.department_name,
+                d.organisation_name,
+                d.sub_building_name,
+                d.building_name,
+                d.building_number,
+                d.dependent_thoroughfare,
+                d.thoroughfare,
+                d.double_dependent_locality,
+                d.dependent_locality,
+                d.post_town
             FROM delivery_point d
             WHERE d.postcode IS NOT NULL
+              -- Cheap NULL-mask check before the distinct and the string
+              -- assembly: rows with no address text at all can never pass
+              -- the raw_address <> '' filter below
+              AND (d.department_name IS NOT NULL
+                   OR d.organisation_name IS NOT NULL
+                   OR d.sub_building_name IS NOT NULL
+                   OR d.building_name IS NOT NULL
+                   OR d.building_number IS NOT NULL
+                   OR d.dependent_thoroughfare IS NOT NULL
+                   OR d.thoroughfare IS NOT NULL
+                   OR d.double_dependent_locality IS NOT NULL
+                   OR d.dependent_locality IS NOT NULL
+                   OR d.post_town IS NOT NULL)
+        ),
+        delivery_rendered AS (
+            SELECT
+                d.uprn,
+                d.postcode AS postcode,
+                -- A single flat concat_ws: NULL inputs are skipped without
+                -- separators, so the nested grouping (and its intermediate
+                -- string allocation per row) is unnecessary
+                concat_ws(' ',
+                    NULLIF(TRIM(d.department_name), ''),
+                    NULLIF(TRIM(d.organisation_name), ''),
+                    NULLIF(TRIM(d.sub_building_name), ''),
+                    NULLIF(TRIM(d.building_name), ''),
+                    d.building_number,
+                    NULLIF(TRIM(d.dependent_thoroughfare), ''),
+                    NULLIF(TRIM(d.thoroughfare), ''),
+                    NULLIF(TRIM(d.double_dependent_locality), ''),
+                    NULLIF(TRIM(d.dependent_locality), ''),
+                    NULLIF(TRIM(d.post_town), '')
+                ) AS raw_address
+            FROM delivery_distinct d
         )
         SELECT
             uprn,
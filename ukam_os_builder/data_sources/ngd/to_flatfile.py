@@ -587,15 +587,18 @@ def _hash_partition_predicate(num_chunks: int, chunk_index: int) -> str:
 
 def _ensure_uprn_column(con: duckdb.DuckDBPyConnection, parquet_paths: list[Path]) -> None:
     """Verify that UPRN exists in all required parquet schemas."""
-    missing_uprn: list[str] = []
-
-    for path in parquet_paths:
-        columns = con.execute(
-            f"DESCRIBE SELECT * FROM read_parquet('{path.as_posix()}')"
-        ).fetchall()
-        column_names = {row[0].lower() for row in columns}
-        if "uprn" not in column_names:
-            missing_uprn.append(path.name)
+    # One parquet_schema call over the whole list reads just the footers,
+    # instead of a DESCRIBE (full schema bind) per file
+    rows = con.execute(
+        """
+        SELECT file_name
+        FROM parquet_schema(?)
+        GROUP BY file_name
+        HAVING NOT bool_or(lower(name) = 'uprn')
+        """,
+        [[path.as_posix() for path in parquet_paths]],
+    ).fetchall()
+    missing_uprn = [Path(row[0]).name for row in rows]
 
     if missing_uprn:
         missing_list = ", ".join(sorted(missing_uprn))
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import logging
+import os
 from pathlib import Path
 from typing import Any, Literal
 
 import duckdb
 import yaml
 
+from ukam_os_builder.api.settings import _YamlLoader
+
 SourceType = Literal["ngd", "abp"]
 
 logger = logging.getLogger(__name__)
@@ -27,11 +30,11 @@ def _resolve_path(base_dir: Path, path_str: str) -> Path:
     path = Path(path_str)
     if path.is_absolute():
         return path
-    return (base_dir / path).resolve()
+    return Path(os.path.normpath(base_dir / path))
 
 
 def _read_config_for_output(config_path: Path) -> tuple[Path, SourceType]:
-    raw = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+    raw = yaml.load(config_path.read_text(encoding="utf-8"), Loader=_YamlLoader) or {}
     if not isinstance(raw, dict):
         raise ValueError(f"Invalid config format: {config_path}")
 
@@ -74,12 +77,20 @@ def _resolve_runtime_context(
 
     pattern = _pattern_for_source(source_value)
     output_files = sorted(output_dir_path.glob(pattern))
+    if not output_files:
+        # Per-thread output mode writes one directory of parquet files per
+        # chunk instead of one file per chunk
+        dir_pattern = pattern.removesuffix(".parquet") + "/*.parquet"
+        output_files = sorted(output_dir_path.glob(dir_pattern))
     if not output_files:
         raise FileNotFoundError(
             f"No flatfile outputs found in {output_dir_path} matching {pattern}"
         )
 
-    files_sql = (output_dir_path / pattern).as_posix()
+    # We have already resolved the glob; pass the explicit file list so
+    # DuckDB's parquet scanner does not walk the directory a second time
+    files_sql = "[" + ", ".join(f"'{path.as_posix()}'" for path in output_files) + "]"
+
     return source_value, output_dir_path, files_sql, output_files
 
 
@@ -88,7 +99,13 @@ def _choose_select_columns(
     files_sql: str,
     requested_columns: list[str] | None = None,
 ) -> str:
-    available_columns = con.sql(f"SELECT * FROM read_parquet('{files_sql}') LIMIT 0").columns
+    # Footer-only read: parquet_schema avoids binding a full scan just to
+    # learn the column names. Non-column schema elements (e.g. the root)
+    # never collide with the requested names, so no filtering is needed.
+    available_columns = {
+        row[0]
+        for row in con.execute(f"SELECT DISTINCT name FROM parquet_schema({files_sql})").fetchall()
+    }
     desired = requested_columns or _DEFAULT_SELECT_COLUMNS
     selected = [column for column in desired if column in available_columns]
     if not selected:
@@ -104,12 +121,12 @@ def get_flatfile(
     output_dir: str | Path | None = None,
 ) -> duckdb.DuckDBPyRelation:
     """Load the full flatfile relation for the configured source."""
-    _, _, files_sql, _ = _resolve_runtime_context(
+    _, _, _, output_files = _resolve_runtime_context(
         config_path=config_path,
         source=source,
         output_dir=output_dir,
     )
-    return con.read_parquet(files_sql)
+    return con.read_parquet([path.as_posix() for path in output_files])
 
 
 def get_variant_statistics(
@@ -129,7 +146,7 @@ def get_variant_statistics(
     stats = con.sql(f"""
         WITH variant_counts AS (
             SELECT unique_id, COUNT(*) AS variant_count
-            FROM read_parquet('{files_sql}')
+            FROM read_parquet({files_sql})
             GROUP BY unique_id
         )
         SELECT
@@ -180,7 +197,7 @@ def get_random_uprn(
     select_columns = _choose_select_columns(con, files_sql, columns)
     random_uprn = con.sql(f"""
         SELECT DISTINCT unique_id
-        FROM read_parquet('{files_sql}')
+        FROM read_parquet({files_sql})
         ORDER BY RANDOM()
         LIMIT 1
     """).fetchone()
@@ -191,7 +208,7 @@ def get_random_uprn(
     return con.sql(f"""
         SELECT
             {select_columns}
-        FROM read_parquet('{files_sql}')
+        FROM read_parquet({files_sql})
         WHERE unique_id = {int(random_uprn[0])}
         ORDER BY is_primary DESC NULLS LAST, source NULLS LAST, variant_label NULLS LAST
     """)
@@ -221,7 +238,7 @@ def get_random_large_uprn(
     selected = con.sql(f"""
         WITH variant_counts AS (
             SELECT unique_id, COUNT(*) AS variant_count
-            FROM read_parquet('{files_sql}')
+            FROM read_parquet({files_sql})
             {where_filter}
             GROUP BY unique_id
             ORDER BY variant_count DESC, unique_id ASC
@@ -239,7 +256,7 @@ def get_random_large_uprn(
     return con.sql(f"""
         SELECT
             {select_columns}
-        FROM read_parquet('{files_sql}')
+        FROM read_parquet({files_sql})
         WHERE unique_id = {int(selected[0])}
         {and_filter}
         ORDER BY is_primary DESC NULLS LAST, source NULLS LAST, variant_label NULLS LAST
@@ -268,7 +285,7 @@ def get_uprn_variants(
     return con.sql(f"""
         SELECT
             {select_columns}
-        FROM read_parquet('{files_sql}')
+        FROM read_parquet({files_sql})
         WHERE unique_id = {int(uprn)}
         {and_filter}
         ORDER BY is_primary DESC NULLS LAST, source NULLS LAST, variant_label NULLS LAST
@@ -306,7 +323,7 @@ def inspect_flatfile_variants(
     sample_rows = con.execute(
         f"""
         SELECT *
-        FROM read_parquet('{files_sql}')
+        FROM read_parquet({files_sql})
         LIMIT {sample_limit}
         """
     ).fetchall()
@@ -315,7 +332,7 @@ def inspect_flatfile_variants(
         top = con.execute(
             f"""
             WITH data AS (
-                SELECT * FROM read_parquet('{files_sql}')
+                SELECT * FROM read_parquet({files_sql})
             )
             SELECT unique_id, COUNT(*) AS variant_count
             FROM data
@@ -332,7 +349,7 @@ def inspect_flatfile_variants(
         count_row = con.execute(
             f"""
             SELECT COUNT(*)
-            FROM read_parquet('{files_sql}')
+            FROM read_parquet({files_sql})
             WHERE unique_id = ?
             """,
             [target_uprn],
@@ -342,7 +359,7 @@ def inspect_flatfile_variants(
     detail_rows = con.execute(
         f"""
         SELECT *
-        FROM read_parquet('{files_sql}')
+        FROM read_parquet({files_sql})
         WHERE unique_id = ?
         ORDER BY 1
         """,
@@ -354,11 +371,11 @@ def inspect_flatfile_variants(
         logger.info("Matched files: %d", len(output_files))
         logger.info("Selected UPRN: %s (variants: %d)", target_uprn, variant_count)
         logger.info("Sample rows:")
-        con.sql(f"SELECT * FROM read_parquet('{files_sql}') LIMIT {sample_limit}").show(
+        con.sql(f"SELECT * FROM read_parquet({files_sql}) LIMIT {sample_limit}").show(
             max_width=10_000
         )
         logger.info("Selected UPRN rows:")
-        con.sql(f"SELECT * FROM read_parquet('{files_sql}') WHERE unique_id = {target_uprn}").show(
+        con.sql(f"SELECT * FROM read_parquet({files_sql}) WHERE unique_id = {target_uprn}").show(
             max_width=10_000
         )
 
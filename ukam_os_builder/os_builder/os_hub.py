@@ -8,6 +8,8 @@ from typing import Any
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ukam_os_builder.api.settings import Settings
 
@@ -19,6 +21,23 @@ API_BASE_URL = "https://api.os.uk/downloads/v1"
 _NGD_EXCLUDED_STEMS = {"historicaddress"}
 
 
+def _create_session() -> requests.Session:
+    """Build a session with pooled connections and transport-level retries.
+
+    Reusing one session keeps the TLS connection to the OS Data Hub alive
+    across the metadata call and each file download, instead of paying a
+    full handshake per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.5),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
 def _should_skip_ngd_download(filename: str, settings: object) -> bool:
     """Return True if *filename* is an NGD historic-address archive."""
     source_type = getattr(getattr(settings, "source", None), "type", "")
@@ -88,7 +107,7 @@ def _find_existing_download_archives(downloads_dir: Path) -> list[Path]:
     return sorted(downloads_dir.glob("*.zip"))
 
 
-def get_package_version(settings: Any) -> dict:
+def get_package_version(settings: Any, session: requests.Session | None = None) -> dict:
     """Fetch package version metadata from the OS Data Hub API."""
     package_id = settings.os_downloads.package_id
     version_id = settings.os_downloads.version_id
@@ -108,10 +127,15 @@ def get_package_version(settings: Any) -> dict:
     )
 
     logger.debug("Fetching package metadata from %s", url)
-    response = requests.get(url, headers=headers, timeout=(connect_timeout, read_timeout))
-    response.raise_for_status()
-
-    return response.json()
+    sess = session or _create_session()
+    try:
+        response = sess.get(url, headers=headers, timeout=(connect_timeout, read_timeout))
+        response.raise_for_status()
+        return response.json()
+    finally:
+        # Only close sessions we created; callers own the ones they pass in
+        if session is None:
+            sess.close()
 
 
 def list_downloads(metadata: dict) -> list[DownloadItem]:
@@ -204,13 +228,14 @@ def download_file(
 
     logger.info("Downloading %s...", dest_path.name)
 
-    sess = session or requests.Session()
-    response = sess.get(
-        download_url,
-        stream=True,
-        timeout=(connect_timeout_seconds, read_timeout_seconds),
-    )
+    sess = session or _create_session()
+    response = None
     try:
+        response = sess.get(
+            download_url,
+            stream=True,
+            timeout=(connect_timeout_seconds, read_timeout_seconds),
+        )
         response.raise_for_status()
 
         total_size = int(response.headers.get("content-length", 0))
@@ -237,7 +262,11 @@ def download_file(
                     )
                     next_log += 10 * 1024 * 1024
     finally:
-        response.close()
+        if response is not None:
+            response.close()
+        # Only close sessions we created; callers own the ones they pass in
+        if session is None:
+            sess.close()
 
     if expected_md5:
         actual_md5 = md5_hash.hexdigest()  # type: ignore[union-attr]
@@ -295,39 +324,39 @@ def run_download_step(
             original_exc=exc,
         )
 
-    logger.info("Fetching package metadata...")
-    try:
-        metadata = get_package_version(settings)
-    except (requests.exceptions.RequestException, OSError) as exc:
-        if list_only:
-            raise
-        return _use_existing_archives_or_raise(
-            downloads_dir,
-            reason=f"Could not reach OS Data Hub ({exc.__class__.__name__})",
-            original_exc=exc,
-        )
-    items = list_downloads(metadata)
+    # One pooled session shared by the metadata call and every download
+    with _create_session() as session:
+        logger.info("Fetching package metadata...")
+        try:
+            metadata = get_package_version(settings, session=session)
+        except (requests.exceptions.RequestException, OSError) as exc:
+            if list_only:
+                raise
+            return _use_existing_archives_or_raise(
+                downloads_dir,
+                reason=f"Could not reach OS Data Hub ({exc.__class__.__name__})",
+                original_exc=exc,
+            )
+        items = list_downloads(metadata)
 
-    if list_only:
-        print_download_summary(metadata, items, api_key)
-        return []
+        if list_only:
+            print_download_summary(metadata, items, api_key)
+            return []
 
-    downloads_dir.mkdir(parents=True, exist_ok=True)
+        downloads_dir.mkdir(parents=True, exist_ok=True)
 
-    connect_timeout = getattr(
-        settings.os_downloads,
-        "connect_timeout_seconds",
-        DEFAULT_CONNECT_TIMEOUT_SECONDS,
-    )
-    read_timeout = getattr(
-        settings.os_downloads,
-        "read_timeout_seconds",
-        DEFAULT_READ_TIMEOUT_SECONDS,
-    )
+        connect_timeout = getattr(
+            settings.os_downloads,
+            "connect_timeout_seconds",
+            DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        )
+        read_timeout = getattr(
+            settings.os_downloads,
+            "read_timeout_seconds",
+            DEFAULT_READ_TIMEOUT_SECONDS,
+        )
 
-    session = requests.Session()
-    downloaded: list[Path] = []
-    try:
+        downloaded: list[Path] = []
         for item in items:
             if not item.url:
                 logger.warning("No URL for %s, skipping", item.filename)
@@ -352,9 +381,6 @@ def run_download_step(
 
             if was_downloaded or dest_path.exists():
                 downloaded.append(dest_path)
-    finally:
-        session.close()
-
     logger.info("Download complete: %d file(s)", len(downloaded))
     return downloaded
 
@@ -1,20 +1,44 @@
 from __future__ import annotations
 
 import argparse
+import re
+from functools import cache
 from pathlib import Path
 
-from rich.console import Console
-from rich.panel import Panel
-
 from ukam_os_builder.api.api import load_existing_defaults, write_config_and_env
 
-console = Console()
+
+class _LazyConsole:
+    """Stand-in for rich.console.Console that defers the rich import.
+
+    The wizard's --help, --non-interactive and --answers paths never touch
+    the console, so the (comparatively heavy) rich import only happens once
+    a prompt or print is actually needed.
+    """
+
+    def __getattr__(self, name: str):
+        from rich.console import Console
+
+        real = self.__dict__.get("_console")
+        if real is None:
+            real = Console()
+            self.__dict__["_console"] = real
+        return getattr(real, name)
+
+
+console = _LazyConsole()
+
+
+# Positive integers without a leading zero; matching is cheaper than letting
+# int() raise on bad interactive input.
+_POSITIVE_INT_RE = re.compile(r"[1-9]\d*")
 
 
 def _prompt_non_empty(label: str, default: str = "") -> str:
+    suffix = f" [{default}]" if default else ""
+    prompt = f"{label}{suffix}: "
     while True:
-        suffix = f" [{default}]" if default else ""
-        value = console.input(f"{label}{suffix}: ", markup=False).strip() or default
+        value = console.input(prompt, markup=False).strip() or default
         if value:
             return value
         console.print("[red]Value is required.[/red]")
@@ -29,19 +53,14 @@ def _prompt_optional(label: str, default: str = "") -> str | None:
 
 
 def _prompt_int(label: str, default: int) -> int:
+    prompt = f"{label} [{default}]: "
     while True:
-        raw = console.input(f"{label} [{default}]: ", markup=False).strip()
+        raw = console.input(prompt, markup=False).strip()
         if not raw:
             return default
-        try:
-            value = int(raw)
-        except ValueError:
-            console.print("[red]Please enter a whole number.[/red]")
-            continue
-        if value < 1:
-            console.print("[red]Value must be >= 1.[/red]")
-            continue
-        return value
+        if _POSITIVE_INT_RE.fullmatch(raw):
+            return int(raw)
+        console.print("[red]Please enter a whole number >= 1.[/red]")
 
 
 def _confirm(label: str, default_yes: bool = True) -> bool:
@@ -52,6 +71,22 @@ def _confirm(label: str, default_yes: bool = True) -> bool:
     return raw in {"y", "yes"}
 
 
+def _load_answers(parser: argparse.ArgumentParser, path: Path) -> dict[str, object]:
+    """Read an answers mapping in one parse instead of N interactive prompts."""
+    import yaml
+
+    from ukam_os_builder.api.settings import _YamlLoader
+
+    try:
+        raw = yaml.load(path.read_text(encoding="utf-8"), Loader=_YamlLoader) or {}
+    except OSError as exc:
+        parser.error(f"could not read answers file: {exc}")
+    if not isinstance(raw, dict):
+        parser.error(f"answers file must be a YAML mapping: {path}")
+    return raw
+
+
+@cache
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="ukam-os-setup",
@@ -92,6 +127,11 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Write config using defaults and any provided required flags.",
     )
+    parser.add_argument(
+        "--answers",
+        default=None,
+        help="YAML file of wizard answers; skips all prompts (for CI/fleet setup).",
+    )
     parser.add_argument(
         "--source",
         choices=["ngd", "abp"],
@@ -100,6 +140,13 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument("--package-id", help="OS package ID (required in non-interactive mode).")
     parser.add_argument("--version-id", help="OS version ID (required in non-interactive mode).")
+    parser.add_argument(
+        "--format",
+        dest="config_format",
+        choices=["yaml", "json"],
+        default="yaml",
+        help="Config output format (default: yaml; json is faster to parse for automation).",
+    )
     return parser
 
 
@@ -120,7 +167,38 @@ def main(argv: list[str] | None = None) -> int:
 
     config = load_existing_defaults(config_out)
 
-    if args.non_interactive:
+    if args.answers:
+        answers = _load_answers(parser, Path(args.answers))
+
+        missing = [key for key in ("source", "package_id", "version_id") if not answers.get(key)]
+        if missing:
+            parser.error(f"answers file is missing required keys: {', '.join(missing)}")
+
+        source_value = str(answers["source"]).strip().lower()
+        if source_value not in {"ngd", "abp"}:
+            parser.error("source must be 'ngd' or 'abp'")
+
+        config["source"]["type"] = source_value
+        config["os_downloads"]["package_id"] = str(answers["package_id"])
+        config["os_downloads"]["version_id"] = str(answers["version_id"])
+        config["paths"] = {
+            "work_dir": str(answers.get("work_dir", config.get("paths", {}).get("work_dir", "./data"))),
+        }
+        for key in (
+            "num_chunks",
+            "parquet_compression",
+            "parquet_compression_level",
+            "duckdb_memory_limit",
+        ):
+            if answers.get(key) is not None:
+                config["processing"][key] = answers[key]
+
+        if answers.get("api_key") or answers.get("api_secret"):
+            api_key = answers.get("api_key")
+            api_secret = answers.get("api_secret")
+            if not (api_key and api_secret):
+                parser.error("api_key and api_secret must be provided together in answers file")
+    elif args.non_interactive:
         if not args.source:
             parser.error("--source is required with --non-interactive")
         if not args.package_id or not args.version_id:
@@ -133,6 +211,8 @@ def main(argv: list[str] | None = None) -> int:
             "work_dir": str(config.get("paths", {}).get("work_dir", "./data")),
         }
     else:
+        from rich.panel import Panel
+
         console.print(
             Panel.fit(
                 "[bold]OS builder setup wizard[/bold]\nProvide required values first, then optional tuning.",
@@ -211,6 +291,7 @@ def main(argv: list[str] | None = None) -> int:
         write_env=write_env,
         api_key=api_key,
         api_secret=api_secret,
+        config_format=args.config_format,
     )
 
     console.print(f"[green]✓[/green] Wrote config: [bold]{config_out}[/bold]")